@@ -0,0 +1,11 @@
+# command line entry point: python -m aoc2023 run 5 12 23 --part 2
+import sys
+from pathlib import Path
+
+# the solvers import from "modules", which lives next to this file
+sys.path.insert(0, str(Path(__file__).parent))
+
+from modules.cli import main
+
+if __name__ == "__main__":
+    main()
@@ -21,3 +21,16 @@ def addwise[T](arr1: list[T], arr2: list[T]) -> list[T]:
 # ex: arr=[1,3,6,10,15], idx_shift=2, result=[5,7,9] ([6 - 1, 10 - 3, 15 - 6])
 def shifted_diff[T](arr: list[T], idx_shift: int) -> list[T]:
     return [arr[idx] - arr[idx - idx_shift] for idx in range(idx_shift, len(arr))]
+
+# max of the values in each run of equal keys (keys must be grouped together, e.g. sorted)
+# ex: keys=[1,1,2,2,2], values=[3,5,4,1,2], result=([1,2], [5,4])
+def group_max[K, T](keys: list[K], values: list[T]) -> tuple[list[K], list[T]]:
+    (group_keys, maxes) = ([], [])
+    for (key, value) in zip(keys, values):
+        if group_keys and group_keys[-1] == key:
+            if value > maxes[-1]:
+                maxes[-1] = value
+        else:
+            group_keys.append(key)
+            maxes.append(value)
+    return (group_keys, maxes)
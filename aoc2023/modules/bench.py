@@ -0,0 +1,132 @@
+### benchmarks: times each day on its real input and on scaled-up synthetic inputs
+# results can be saved as a JSON baseline; later runs fail if a day has gotten slower than the threshold
+import argparse
+import json
+import sys
+from pathlib import Path
+from statistics import median, quantiles
+from time import perf_counter
+from typing import NamedTuple
+
+from modules.generate import scale_input
+from modules.parse import get_input
+from modules.registry import all_days
+from modules.runner import get_runs, run_solver
+
+default_baseline = Path(__file__).parent.parent / "bench" / "baseline.json"
+
+
+class Timings(NamedTuple):
+    median: float
+    p95: float
+    parse_median: float
+    solve_median: float
+    runs: int
+
+
+class BenchResult(NamedTuple):
+    day: int
+    part: int
+    scale: int
+    timings: Timings | None
+    error: str | None = None
+
+    def key(self) -> str:
+        return f"{self.day:02}.{self.part}.x{self.scale}"
+
+    def __str__(self):
+        label = f"day {self.day:2} part {self.part} x{self.scale:<4}"
+        if self.error:
+            return f"{label} error: {self.error}"
+        t = self.timings
+        return f"{label} median {t.median * 1000:10.1f}ms   p95 {t.p95 * 1000:10.1f}ms   ({t.runs} runs; parse {t.parse_median * 1000:.1f}ms, solve {t.solve_median * 1000:.1f}ms)"
+
+
+def p95(values: list[float]) -> float:
+    return quantiles(values, n=20, method="inclusive")[18] if len(values) > 1 else values[0]
+
+def bench_input(day: int, part: int, input: str, repeats: int, budget: float, use_cache: bool) -> Timings:
+    # keeps repeating until it has enough runs or runs out of time (always at least one run)
+    (parses, solves) = ([], [])
+    start = perf_counter()
+    while len(solves) < repeats and (not solves or perf_counter() - start < budget):
+        res = run_solver(day, part, input, trace_memory=False, use_cache=use_cache)
+        parses.append(res.parse.seconds)
+        solves.append(res.solve.seconds)
+    totals = [parse + solve for (parse, solve) in zip(parses, solves)]
+    return Timings(median(totals), p95(totals), median(parses), median(solves), len(totals))
+
+def bench_part(day: int, part: int, scales: list[int], repeats: int, budget: float, use_cache: bool) -> list[BenchResult]:
+    input = get_input(day)
+    results = []
+    for scale in scales:
+        scaled = scale_input(day, input, scale)
+        if scaled is None:
+            continue
+        try:
+            timings = bench_input(day, part, scaled, repeats, budget, use_cache)
+        except Exception as e:
+            results.append(BenchResult(day, part, scale, None, f"{type(e).__name__}: {e}"))
+            break
+        results.append(BenchResult(day, part, scale, timings))
+        # a single run already took longer than the budget, so larger scales would take even longer
+        if timings.median > budget:
+            break
+    return results
+
+
+def load_baseline(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_baseline(path: Path, results: list[BenchResult]):
+    baseline = load_baseline(path)
+    baseline.update({res.key(): res.timings._asdict() for res in results if res.timings})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+def check_regression(res: BenchResult, baseline: dict[str, dict], threshold: float, min_delta: float) -> str | None:
+    if not res.timings or (prev := baseline.get(res.key())) is None:
+        return None
+    (now, before) = (res.timings.median, prev["median"])
+    # tiny runs are too noisy to compare by ratio alone, so they also need to be slower by min_delta seconds
+    if now > before * (1 + threshold) and now - before > min_delta:
+        return f"{res.key()} regressed: {before * 1000:.1f}ms -> {now * 1000:.1f}ms ({now / before - 1:+.0%})"
+    return None
+
+def bench(args: argparse.Namespace):
+    days = args.days or all_days()
+    parts = [args.part] if args.part else [1, 2]
+    baseline = load_baseline(args.baseline)
+    (results, regressions) = ([], [])
+    for (day, part) in get_runs(days, parts):
+        for res in bench_part(day, part, args.scales, args.repeats, args.budget, args.cache):
+            print(res, flush=True)
+            results.append(res)
+            if (regression := check_regression(res, baseline, args.threshold, args.min_delta)):
+                regressions.append(regression)
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"saved baseline to {args.baseline}")
+    for regression in regressions:
+        print(regression)
+    if regressions:
+        sys.exit(1)
+
+
+def add_parser(commands: argparse._SubParsersAction):
+    parser = commands.add_parser("bench", help="benchmark days on their real and scaled-up inputs, comparing against a baseline")
+    parser.add_argument("days", nargs="*", type=int, help="days to benchmark (default: all)")
+    parser.add_argument("--part", type=int, choices=[1, 2], help="only benchmark this part (default: both)")
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 2, 10, 100], help="input size factors (default: 1 2 10 100)")
+    parser.add_argument("--repeats", type=int, default=5, help="runs per input, for the median and p95 (default: 5)")
+    parser.add_argument("--budget", type=float, default=30, help="seconds to spend repeating each input; larger scales are skipped once a single run exceeds it (default: 30)")
+    parser.add_argument("--cache", action="store_true", help="use the on-disk parse cache, so repeated runs mostly time the solve step")
+    parser.add_argument("--baseline", type=Path, default=default_baseline, help=f"baseline file (default: {default_baseline})")
+    parser.add_argument("--save", action="store_true", help="save these results to the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="fail if a median is this much slower than the baseline (default: 0.25, i.e. 25%%)")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="ignore slowdowns smaller than this many seconds (default: 0.005)")
+    parser.set_defaults(handler=bench)
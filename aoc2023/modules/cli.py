@@ -0,0 +1,23 @@
+### command line entry point
+# usage: python -m aoc2023 run 5 12 23 --part 2
+#        python -m aoc2023 stream 12 --path big_input.txt --workers 4
+#        python -m aoc2023 bench 11 24 25 --scales 1 10
+#        python -m aoc2023 microbench pq --size 1000000
+import argparse
+from modules import bench, microbench, runner
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="aoc2023")
+    commands = parser.add_subparsers(dest="command", required=True)
+    runner.add_parser(commands)
+    bench.add_parser(commands)
+    microbench.add_parser(commands)
+    return parser
+
+def main(argv: list[str] = None):
+    args = get_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+### synthetic input generation
+# scales a real input up by (roughly) a size factor, keeping it valid for the day's solver
+# days whose inputs have structure that can't simply be repeated (loops, mazes, cycles) have no scaler
+import re
+from itertools import batched
+from math import isqrt
+from random import Random
+from typing import Callable
+
+# returns None if the input can't be scaled by exactly that factor
+Scaler = Callable[[str, int], str | None]
+
+# fixed seed, so the same scale of the same input always produces the same text
+def get_random(factor: int) -> Random:
+    return Random(factor)
+
+def repeat_lines(input: str, factor: int) -> str:
+    lines = input.splitlines()
+    return "\n".join(lines * factor)
+
+def repeat_sections(input: str, factor: int) -> str:
+    return "\n\n".join([input.strip()] * factor)
+
+def repeat_steps(input: str, factor: int) -> str:
+    return ",".join([input.strip()] * factor)
+
+# tiles the grid in both directions, as close to square as the factor allows (e.g. 2 = 1x2, 10 = 2x5, 100 = 10x10),
+# so the number of cells grows by exactly the factor
+def tile_grid(input: str, factor: int) -> str:
+    row_tiles = max(tiles for tiles in range(1, isqrt(factor) + 1) if factor % tiles == 0)
+    col_tiles = factor // row_tiles
+    lines = [line * col_tiles for line in input.splitlines()]
+    return "\n".join(lines * row_tiles)
+
+# day 14: the rocks tilt in every direction, so the grid has to stay square, which only works for square factors
+def tile_square_grid(input: str, factor: int) -> str | None:
+    return tile_grid(input, factor) if isqrt(factor) ** 2 == factor else None
+
+# repeats "Game 1: ..." style lines, renumbering them so the ids stay unique
+def renumber_lines(input: str, factor: int) -> str:
+    lines = input.splitlines() * factor
+    return "\n".join([re.sub(r"\d+", str(num), line, count=1) for (num, line) in enumerate(lines, 1)])
+
+# day 5: more seeds (in pairs, since part 2 reads them as ranges)
+def scale_seeds(input: str, factor: int) -> str:
+    (seeds, rest) = input.split("\n", 1)
+    pairs = list(batched([int(num) for num in seeds.split(" ")[1:]], 2))
+    scaled = [(start + copy, length) for copy in range(factor) for (start, length) in pairs]
+    return f"seeds: {' '.join(f'{start} {length}' for (start, length) in scaled)}\n{rest}"
+
+# day 6: more races (which also makes the kerned race much longer)
+def scale_races(input: str, factor: int) -> str:
+    lines = [line.split() for line in input.splitlines()]
+    return "\n".join(f"{line[0]} {' '.join(line[1:] * factor)}" for line in lines)
+
+# day 7: random hands, since repeated hands would tie
+def random_hands(input: str, factor: int) -> str:
+    rand = get_random(factor)
+    num_hands = len(input.splitlines()) * factor
+    return "\n".join(f"{''.join(rand.choices('23456789TJQKA', k=5))} {rand.randint(1, 1000)}" for _ in range(num_hands))
+
+# day 19: more parts to rate (the workflows are named, so they stay as they are)
+def scale_parts(input: str, factor: int) -> str:
+    (flows, parts) = input.strip().split("\n\n")
+    return f"{flows}\n\n{repeat_lines(parts, factor)}"
+
+# day 22: stacks copies of the bricks on top of each other
+def stack_bricks(input: str, factor: int) -> str:
+    bricks = [[[int(num) for num in end.split(",")] for end in line.split("~")] for line in input.splitlines()]
+    height = max(end[2] for brick in bricks for end in brick)
+    return "\n".join(
+        "~".join(f"{x},{y},{z + copy * height}" for (x, y, z) in brick)
+        for copy in range(factor) for brick in bricks)
+
+# day 24: nudged copies of the hailstones (exact copies would all be parallel)
+def scale_hail(input: str, factor: int) -> str:
+    rand = get_random(factor)
+    rocks = [[int(num) for num in re.findall(r"-?\d+", line)] for line in input.splitlines()]
+    lines = input.splitlines()
+    for _ in range(factor - 1):
+        for rock in rocks:
+            pos = [num + rand.randint(-10**12, 10**12) for num in rock[:3]]
+            vel = [num + rand.choice([-2, -1, 1, 2]) for num in rock[3:]]
+            lines.append(f"{', '.join(map(str, pos))} @ {', '.join(map(str, vel))}")
+    return "\n".join(lines)
+
+# day 25: two random clusters joined by three wires, with as many components as the scaled input
+def random_network(input: str, factor: int) -> str:
+    rand = get_random(factor)
+    num_nodes = len(set(re.findall(r"[a-z]+", input))) * factor
+    half = num_nodes // 2
+    lines = []
+    for (lo, hi) in [(0, half), (half, num_nodes)]:
+        for idx in range(lo, hi):
+            # at least four wires per component, so only the three bridges can split the network in two
+            others = set()
+            while len(others) < 4:
+                if (other := rand.randrange(lo, hi)) != idx:
+                    others.add(other)
+            lines.append(f"n{idx}: {' '.join(f'n{other}' for other in others)}")
+    bridges = [f"n{rand.randrange(0, half)}: n{rand.randrange(half, num_nodes)}" for _ in range(3)]
+    return "\n".join(lines + bridges)
+
+scalers: dict[int, Scaler] = {
+    1: repeat_lines,
+    2: renumber_lines,
+    3: repeat_lines,
+    4: renumber_lines,
+    5: scale_seeds,
+    6: scale_races,
+    7: random_hands,
+    9: repeat_lines,
+    11: tile_grid,
+    12: repeat_lines,
+    13: repeat_sections,
+    14: tile_square_grid,
+    15: repeat_steps,
+    16: tile_grid,
+    17: tile_grid,
+    19: scale_parts,
+    22: stack_bricks,
+    24: scale_hail,
+    25: random_network,
+}
+
+def scale_input(day: int, input: str, factor: int) -> str | None:
+    """ The input scaled up by exactly the factor, or None if the day has no scaler or can't be scaled that much. """
+    if factor == 1:
+        return input
+    scaler = scalers.get(day)
+    return scaler(input, factor) if scaler else None
@@ -0,0 +1,132 @@
+### instrumentation: call counts, cumulative time and (optionally) peak memory for named hot-path sections
+# off by default; while off, @timed hands back the undecorated function, so instrumented code runs at full speed
+# turned on with the AOC_INSTRUMENT environment variable ("time", or "memory" to also trace peaks), which is read
+# when this module is imported; the runner sets it for --profile, so worker processes pick it up too
+import os
+import tracemalloc
+from functools import wraps
+from time import perf_counter
+from typing import Callable, NamedTuple
+
+mode = os.environ.get("AOC_INSTRUMENT", "")
+enabled = mode in ("time", "memory")
+trace_memory = mode == "memory"
+
+
+class Section(NamedTuple):
+    name: str
+    calls: int
+    seconds: float
+    peak: int | None    # largest growth in traced memory during a single call, None if memory wasn't traced
+
+    def __str__(self):
+        peak = f"   peak {self.peak / 2**20:8.2f}MB" if self.peak is not None else ""
+        per_call = self.seconds / self.calls * 1e6 if self.calls else 0
+        return f"  {self.name:<28} {self.calls:>10} calls {self.seconds * 1000:10.1f}ms {per_call:10.2f}us/call{peak}"
+
+
+class SectionStats:
+    """ Running totals for one section; shared by every function and block recorded under its name. """
+    def __init__(self, name: str):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.peak: int | None = None
+
+    def record(self, seconds: float, peak: int | None, calls=1):
+        self.calls += calls
+        self.seconds += seconds
+        if peak is not None:
+            self.peak = max(self.peak or 0, peak)
+
+    def snapshot(self) -> Section:
+        return Section(self.name, self.calls, self.seconds, self.peak)
+
+
+sections: dict[str, SectionStats] = {}
+
+def get_section(name: str) -> SectionStats:
+    if name not in sections:
+        sections[name] = SectionStats(name)
+    return sections[name]
+
+def enable(memory=False):
+    """ Turns instrumentation on for this process and any it starts. Only affects functions decorated afterwards. """
+    global mode, enabled, trace_memory
+    (mode, enabled, trace_memory) = ("memory" if memory else "time", True, memory)
+    os.environ["AOC_INSTRUMENT"] = mode
+
+def start_memory():
+    # the peak is reset on entry to each section, so the caller's own tracing would no longer be meaningful
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    return tracemalloc.get_traced_memory()[0]
+
+def stop_memory(start: int) -> int:
+    return tracemalloc.get_traced_memory()[1] - start
+
+
+def timed[**P, T](name: str) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """ Decorator recording each call of the function under the section name. """
+    def decorate(fn: Callable[P, T]) -> Callable[P, T]:
+        if not enabled:
+            return fn
+        stats = get_section(name)
+        if trace_memory:
+            @wraps(fn)
+            def traced(*args: P.args, **kwargs: P.kwargs) -> T:
+                mem_start = start_memory()
+                start = perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    stats.record(perf_counter() - start, stop_memory(mem_start))
+            return traced
+        @wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stats.record(perf_counter() - start, None)
+        return wrapper
+    return decorate
+
+
+class section:
+    """ Context manager recording a block under the section name; does nothing while instrumentation is off. """
+    def __init__(self, name: str):
+        self.stats = get_section(name) if enabled else None
+
+    def __enter__(self):
+        if self.stats:
+            self.mem_start = start_memory() if trace_memory else None
+            self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.stats:
+            seconds = perf_counter() - self.start
+            self.stats.record(seconds, stop_memory(self.mem_start) if self.mem_start is not None else None)
+        return False
+
+
+def record(name: str, calls: int, seconds: float):
+    """
+    Records a batch of calls at once, e.g. every node a search visited, where wrapping each one would cost more than
+    the work itself. Does nothing while instrumentation is off.
+    """
+    if enabled:
+        get_section(name).record(seconds, None, calls)
+
+
+def take() -> list[Section]:
+    """ Snapshots the sections which were hit since the last take, slowest first, and resets them. """
+    res = sorted((stats.snapshot() for stats in sections.values() if stats.calls), key=lambda s: -s.seconds)
+    for stats in sections.values():
+        stats.reset()
+    return res
@@ -0,0 +1,120 @@
+### micro-benchmarks: times shared data structures in isolation, away from any one day's solver
+# usage: python -m aoc2023 microbench pq --size 1000000
+#        python -m aoc2023 microbench search --size 300
+import argparse
+from heapq import heappop, heappush
+from random import Random
+from time import perf_counter
+from typing import Callable
+
+from modules.search import WeightedAdjacency, astar, bfs_layers, dijkstra, longest_path, visited_backends
+from modules.types import KeyedPQ
+
+
+class ScanPQ[T, TKey]:
+    """ The old list-scanning KeyedPQ, kept as a reference: replacing finds and removes the old item in O(n). """
+    def __init__(self, key: Callable[[T], TKey], replace_if: Callable[[T, T], bool]):
+        self.key = key
+        self.replace_if = replace_if
+        self.pq: list[T] = []
+        self.items: dict[TKey, T] = {}
+
+    def add(self, item: T) -> bool:
+        item_key = self.key(item)
+        do_add = True
+        if item_key in self.items and (do_add := self.replace_if((existing := self.items[item_key]), item)) and existing in self.pq:
+            self.pq.remove(existing)
+        if do_add:
+            heappush(self.pq, item)
+            self.items[item_key] = item
+        return do_add
+
+    def pop(self) -> T:
+        return heappop(self.pq)
+
+
+def time_pq(pq: KeyedPQ | ScanPQ, items: list[tuple[int, int]], updates: list[tuple[int, int]], pops: int) -> tuple[float, float, float]:
+    start = perf_counter()
+    for item in items:
+        pq.add(item)
+    filled = perf_counter()
+    for item in updates:
+        pq.add(item)
+    updated = perf_counter()
+    for _ in range(pops):
+        pq.pop()
+    popped = perf_counter()
+    return (filled - start, updated - filled, popped - updated)
+
+def bench_pq(args: argparse.Namespace):
+    # items are (priority, key) pairs; updates lower the priority of random queued keys (decrease-key)
+    rand = Random(args.size)
+    items = [(rand.randrange(args.size * 10), key) for key in range(args.size)]
+    updates = [(items[key][0] - rand.randint(1, 1000), key) for key in rand.sample(range(args.size), args.ops)]
+    options = dict(key=lambda item: item[1], replace_if=lambda old, new: new[0] < old[0])
+    print(f"{args.size} items, {args.ops} decrease-keys, {args.ops} pops")
+    results = {}
+    for (name, pq) in [("indexed heap", KeyedPQ(**options)), ("list scan", ScanPQ(**options))]:
+        (fill, update, pop) = results[name] = time_pq(pq, items, updates, args.ops)
+        print(f"{name:>12}: fill {fill * 1000:10.1f}ms   decrease-key {update / args.ops * 1e6:10.2f}us/op   pop {pop / args.ops * 1e6:10.2f}us/op")
+    speedup = results["list scan"][1] / results["indexed heap"][1]
+    print(f"decrease-key speedup: {speedup:.0f}x")
+
+
+def weighted_grid(side: int, rand: Random) -> WeightedAdjacency:
+    # side x side grid of random 1-9 costs for entering each cell, like day 17 (and day 21 or 25, ignoring the costs)
+    costs = [rand.randint(1, 9) for _ in range(side * side)]
+    adj: WeightedAdjacency = [[] for _ in range(side * side)]
+    for id in range(side * side):
+        (row, col) = divmod(id, side)
+        for (d_row, d_col) in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            if 0 <= row + d_row < side and 0 <= col + d_col < side:
+                next = (row + d_row) * side + col + d_col
+                adj[id].append((costs[next], next))
+    return adj
+
+def time_search(name: str, search: Callable[[], int]):
+    start = perf_counter()
+    res = search()
+    print(f"{name:>24}: {(perf_counter() - start) * 1000:10.1f}ms   ({res})")
+
+def bench_search(args: argparse.Namespace):
+    # one synthetic graph per search strategy, each shaped like the day which uses it
+    rand = Random(args.size)
+    side = args.size
+    grid = weighted_grid(side, rand)
+    unweighted = [[next for (_, next) in edges] for edges in grid]
+    goal = side * side - 1
+    print(f"{side}x{side} grid ({side * side} nodes)")
+    for (name, backend) in visited_backends.items():
+        def bfs():
+            visited = backend(side * side)
+            visited.add(0)
+            return f"{sum(1 for _ in bfs_layers(unweighted.__getitem__, [0], visited))} layers"
+        time_search(f"bfs ({name})", bfs)
+    for name in ("set", "bytes"):
+        time_search(f"dijkstra ({name})", lambda: dijkstra(grid.__getitem__, [0], goal.__eq__, visited=visited_backends[name](side * side)).cost)
+    heuristic = lambda id: (side - 1 - id // side) + (side - 1 - id % side)
+    time_search("a* (bytes)", lambda: astar(grid.__getitem__, [0], goal.__eq__, heuristic, visited_backends["bytes"](side * side)).cost)
+    # longest simple path is exponential, so it gets a small grid (like day 23's graph of junctions)
+    small = weighted_grid(5, rand)
+    time_search("longest path (5x5)", lambda: longest_path(small, 0, 24).cost)
+
+benchmarks: dict[str, Callable[[argparse.Namespace], None]] = {
+    "pq": bench_pq,
+    "search": bench_search,
+}
+
+default_sizes = {"pq": 1_000_000, "search": 300}
+
+def microbench(args: argparse.Namespace):
+    args.size = args.size or default_sizes[args.name]
+    benchmarks[args.name](args)
+
+
+def add_parser(commands: argparse._SubParsersAction):
+    parser = commands.add_parser("microbench", help="benchmark a shared data structure on synthetic data")
+    parser.add_argument("name", choices=benchmarks, help="what to benchmark")
+    parser.add_argument("--size", type=int, help="number of items for pq (default: 1000000), grid side for search (default: 300)")
+    parser.add_argument("--ops", type=int, default=200, help="number of operations to time after filling (default: 200; the list scan is O(n) per op)")
+    parser.set_defaults(handler=microbench)
@@ -1,13 +1,33 @@
 ### parsing utils
+import inspect
+import mmap
+import operator
+import os
+import pickle
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import cache, partial, reduce
+from hashlib import sha256
+from pathlib import Path
+from typing import Callable, Iterator
+from itertools import batched
+from modules.registry import load_day, load_module
 from modules.types import Loc
 
+modules_dir = Path(__file__).parent
+inputs_dir = Path(__file__).parent.parent / "inputs"
+cache_dir = Path(__file__).parent.parent / ".cache" / "parse"
+
 def load_input_file(fname):
     with open(fname) as f:
         return f.read()
 
-def get_input(num, test=False, file=None):
+def get_input_path(num, test=False, file=None) -> Path:
     file = file or ("test" if test else "input")
-    return load_input_file(f"inputs/{num:02}/{file}.txt")
+    return inputs_dir / f"{num:02}" / f"{file}.txt"
+
+def get_input(num, test=False, file=None):
+    return load_input_file(get_input_path(num, test, file))
 
 def find_in_input(input: str, char: str) -> Loc:
     # add 1 for the newline character
@@ -16,3 +36,137 @@ def find_in_input(input: str, char: str) -> Loc:
     char_col = idx % line_plus_newline_len
     char_row = idx // line_plus_newline_len
     return Loc(char_row, char_col)
+
+
+### parse cache
+# parsed (or preprocessed) inputs are pickled to disk, keyed by a hash of the input text and the parser's version,
+# so changing either the input file or the solver's code invalidates the cached copy
+# parsed values are often built from shared classes (Loc, Grid, Counter...), so every file under modules/ counts as
+# part of the parser's version too; bump cache_version when the cache's own format changes
+cache_version = 2
+
+def describe(value) -> str:
+    # callables are described by name, since their repr includes a memory address that changes every run
+    return f"{value.__module__}.{value.__qualname__}" if callable(value) else repr(value)
+
+@cache
+def get_modules_version() -> str:
+    sources = sha256(f"cache v{cache_version}\n".encode())
+    for path in sorted(modules_dir.rglob("*.py")):
+        sources.update(f"{path.relative_to(modules_dir)}\n".encode())
+        sources.update(path.read_bytes())
+    return sources.hexdigest()
+
+def get_parser_version(parser: Callable) -> str:
+    (func, args, kwargs) = (parser.func, parser.args, parser.keywords) if isinstance(parser, partial) else (parser, (), {})
+    args_str = ", ".join([describe(arg) for arg in args] + [f"{key}={describe(arg)}" for (key, arg) in sorted(kwargs.items())])
+    # the line number tells apart lambdas defined in the same module
+    module_source = inspect.getsource(inspect.getmodule(func))
+    return f"{describe(func)}:{func.__code__.co_firstlineno}({args_str}) {sha256(module_source.encode()).hexdigest()} {get_modules_version()}"
+
+def get_cache_path(input: str, parser: Callable) -> Path:
+    key = sha256(f"{get_parser_version(parser)}\n{input}".encode()).hexdigest()
+    return cache_dir / f"{key}.pickle"
+
+def cached_parse[T](input: str, parser: Callable[[str], T]) -> T:
+    path = get_cache_path(input, parser)
+    if path.exists():
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    parsed = parser(input)
+    try:
+        data = pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL)
+    except (RecursionError, pickle.PicklingError, TypeError, AttributeError):
+        # deeply linked structures, and anything holding lambdas, generators or the like, can't be pickled;
+        # just don't cache them
+        return parsed
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # write then rename, so parallel runs never read a half-written file
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    tmp_path.replace(path)
+    return parsed
+
+
+### streaming input
+# for puzzles where every line is independent: lines are read from a memory-mapped file a chunk at a time,
+# solved one by one and reduced into a running total, so memory use doesn't grow with the size of the input
+# with more than one worker, each worker maps the file itself and is only sent the bounds of its chunk
+# workers are sent the day and part rather than the solver, and load the day themselves: solver modules are only
+# registered in the parent's sys.modules, so a spawned worker couldn't unpickle their functions
+
+reducers: dict[str, tuple[Callable[[int, int], int], int]] = {
+    "sum": (operator.add, 0),
+    "product": (operator.mul, 1),
+}
+
+def get_chunk_bounds(path: Path, chunk_size: int) -> Iterator[tuple[int, int]]:
+    """ (start, end) byte offsets of roughly chunk_size bytes each, always ending just after a newline (or at the end). """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                newline = mm.find(b"\n", min(start + chunk_size, size) - 1)
+                end = size if newline == -1 else newline + 1
+                yield (start, end)
+                start = end
+
+def read_chunk(path: Path, start: int, end: int) -> bytes:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm[start:end]
+
+def reduce_chunk(path: Path, start: int, end: int, day_num: int, part: int) -> int:
+    line_solver = load_day(day_num).line_parts[part]
+    chunk = read_chunk(path, start, end)
+    if line_solver.solve_chunk:
+        return line_solver.solve_chunk(chunk)
+    (combine, initial) = reducers[line_solver.reducer]
+    lines = [line for line in chunk.decode().splitlines() if line]
+    return reduce(combine, map(line_solver.solve_line, lines), initial)
+
+def stream_lines(path: Path, day_num: int, part: int, workers=1, chunk_size=1 << 22) -> int:
+    """
+    Solves each line of the file with the day's line solver for the part, and reduces the answers with its reducer.
+    With solve_chunk, each chunk's raw bytes are solved in one go instead (it must reduce them the same way).
+    Chunks are combined with the same ordering guarantee as map_reduce_lines.
+    """
+    (combine, total) = reducers[load_day(day_num).line_parts[part].reducer]
+    bounds = get_chunk_bounds(path, chunk_size)
+    if workers == 1:
+        for (start, end) in bounds:
+            total = combine(total, reduce_chunk(path, start, end, day_num, part))
+        return total
+    # only a few chunks are in flight at once, so a huge file doesn't queue up a huge number of futures
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight: deque[Future[int]] = deque()
+        max_in_flight = workers * 2
+        for (start, end) in bounds:
+            in_flight.append(pool.submit(reduce_chunk, path, start, end, day_num, part))
+            if len(in_flight) >= max_in_flight:
+                total = combine(total, in_flight.popleft().result())
+        while in_flight:
+            total = combine(total, in_flight.popleft().result())
+    return total
+
+def reduce_lines(lines: tuple[str, ...], day_num: int, func_name: str, kwargs: dict, reducer="sum") -> int:
+    # looked up by name for the same reason as reduce_chunk: a worker can't unpickle a solver module's functions
+    solve_line = partial(getattr(load_module(day_num), func_name), **kwargs)
+    (combine, initial) = reducers[reducer]
+    return reduce(combine, map(solve_line, lines), initial)
+
+def map_reduce_lines(lines: list[str], day_num: int, func_name: str, kwargs: dict = {}, reducer="sum", workers=0, chunk_size=32) -> int:
+    """
+    Solves lines already in memory with the day's module-level function func_name(line, **kwargs), in a pool of
+    processes (0 workers for one per CPU), a chunk of lines at a time. Chunks are combined in input order, so the
+    result doesn't depend on the number of workers.
+    """
+    (combine, total) = reducers[reducer]
+    with ProcessPoolExecutor(max_workers=workers or None) as pool:
+        for chunk_total in pool.map(partial(reduce_lines, day_num=day_num, func_name=func_name, kwargs=kwargs, reducer=reducer), batched(lines, chunk_size)):
+            total = combine(total, chunk_total)
+    return total
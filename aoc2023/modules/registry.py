@@ -0,0 +1,59 @@
+### solver registry
+# loads a day's solver module without running it, so its parse/solve callables can be timed separately
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, NamedTuple
+
+solves_dir = Path(__file__).parent.parent / "solves"
+
+
+class Solver(NamedTuple):
+    """ Callables for one part of a day. parse takes the raw input text, solve takes whatever parse returns. """
+    parse: Callable[[str], Any]
+    solve: Callable[[Any], Any]
+
+
+class LineSolver(NamedTuple):
+    """ For days where every line is independent: solves one line, and says how to combine the answers ("sum" or "product"). """
+    solve_line: Callable[[str], Any]
+    reducer: str = "sum"
+    solve_chunk: Callable[[bytes], Any] | None = None   # optional batch form, solving (and reducing) a whole chunk of lines at once
+
+
+class Day(NamedTuple):
+    num: int
+    name: str
+    parts: dict[int, Solver]
+    line_parts: dict[int, LineSolver]   # parts which can be streamed a line at a time (see parse.stream_lines)
+
+
+def find_day_file(num: int) -> Path:
+    matches = sorted(solves_dir.glob(f"{num:02}_*.py"))
+    if not matches:
+        raise ValueError(f"no solver found for day {num}")
+    return matches[0]
+
+def all_days() -> list[int]:
+    return sorted(int(path.name[:2]) for path in solves_dir.glob("[0-9][0-9]_*.py"))
+
+def load_module(num: int) -> ModuleType:
+    # solver files start with a digit, so they can't be imported normally; register them under a valid name instead
+    # (pickle needs the module in sys.modules to find classes defined in a solver)
+    module_name = f"solves.day{num:02}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, find_day_file(num))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name)
+        raise
+    return module
+
+def load_day(num: int) -> Day:
+    module = load_module(num)
+    return Day(num, find_day_file(num).stem, module.solvers, getattr(module, "line_solvers", {}))
@@ -0,0 +1,131 @@
+### runner: solves one or more days, timing the parse and solve steps separately
+import argparse
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterator, NamedTuple
+
+from modules import instrument
+from modules.parse import cached_parse, get_input, get_input_path, stream_lines
+from modules.registry import all_days, load_day
+
+
+class Measure(NamedTuple):
+    seconds: float
+    peak: int | None    # peak traced memory in bytes, None if memory wasn't traced
+
+    def __str__(self):
+        peak = f"{self.peak / 2**20:8.2f}MB" if self.peak is not None else ""
+        return f"{self.seconds * 1000:10.1f}ms{peak}"
+
+
+class RunResult(NamedTuple):
+    day: int
+    part: int
+    answer: Any
+    parse: Measure
+    solve: Measure
+    sections: list[instrument.Section] = []     # hot-path sections hit while solving, if instrumentation is on
+
+    def __str__(self):
+        res = f"day {self.day:2} part {self.part}: {str(self.answer):>18}   parse {self.parse}   solve {self.solve}"
+        return "\n".join([res] + [str(section) for section in self.sections])
+
+
+def measure[T](fn: Callable[[], T], trace_memory: bool) -> tuple[T, Measure]:
+    # tracing is restarted for each step, so the peak only covers allocations made during that step
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        start = perf_counter()
+        res = fn()
+        seconds = perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return (res, Measure(seconds, peak))
+
+def run_solver(day_num: int, part: int, input: str, trace_memory=True, use_cache=False) -> RunResult:
+    solver = load_day(day_num).parts[part]
+    parse = (lambda: cached_parse(input, solver.parse)) if use_cache else (lambda: solver.parse(input))
+    instrument.take()
+    (parsed, parse_measure) = measure(parse, trace_memory)
+    (answer, solve_measure) = measure(lambda: solver.solve(parsed), trace_memory)
+    return RunResult(day_num, part, answer, parse_measure, solve_measure, instrument.take())
+
+def run_part(day_num: int, part: int, file: str = None, trace_memory=True, use_cache=False) -> RunResult:
+    return run_solver(day_num, part, get_input(day_num, file=file), trace_memory, use_cache)
+
+def stream_part(day_num: int, part: int, path: Path, workers=1, trace_memory=True, chunk_size=1 << 22) -> RunResult:
+    # parsing happens line by line as part of the stream, so it's all timed as solving
+    stream = lambda: stream_lines(path, day_num, part, workers, chunk_size)
+    (answer, solve_measure) = measure(stream, trace_memory)
+    return RunResult(day_num, part, answer, Measure(0, None), solve_measure)
+
+def get_runs(days: list[int], parts: list[int]) -> list[tuple[int, int]]:
+    # days without a solver for the requested part (e.g. day 25 part 2) are skipped
+    return [(day, part) for day in days for part in parts if part in load_day(day).parts]
+
+def iter_results(runs: list[tuple[int, int]], file: str, trace_memory: bool, use_cache: bool, workers: int) -> Iterator[RunResult]:
+    if workers == 1:
+        for (day, part) in runs:
+            yield run_part(day, part, file, trace_memory, use_cache)
+        return
+    # days share no state, so each (day, part) can be solved in its own process; results come back as they finish
+    with ProcessPoolExecutor(max_workers=workers or None) as pool:
+        futures = [pool.submit(run_part, day, part, file, trace_memory, use_cache) for (day, part) in runs]
+        for future in as_completed(futures):
+            yield future.result()
+
+def run(args: argparse.Namespace):
+    days = args.days or all_days()
+    parts = [args.part] if args.part else [1, 2]
+    # instrumentation has to be on before the solvers are loaded, since it's applied when their modules are imported
+    if args.profile:
+        instrument.enable(memory=args.profile == "memory")
+    # per-section memory tracing resets the tracemalloc peak, so the whole-step peaks would be wrong
+    trace_memory = not args.no_memory and args.profile != "memory"
+    total = 0
+    start = perf_counter()
+    for res in iter_results(get_runs(days, parts), args.file, trace_memory, args.cache, args.workers):
+        total += res.parse.seconds + res.solve.seconds
+        print(res, flush=True)
+    print(f"total: {total:.3f}s, wall time: {perf_counter() - start:.3f}s")
+
+def stream(args: argparse.Namespace):
+    line_parts = load_day(args.day).line_parts
+    parts = [args.part] if args.part else list(line_parts)
+    if not parts:
+        print(f"day {args.day} has no parts which can be streamed a line at a time")
+    for part in parts:
+        if part not in line_parts:
+            print(f"day {args.day} part {part} can't be streamed a line at a time")
+            continue
+        path = args.path or get_input_path(args.day, file=args.file)
+        # forked workers would inherit tracing (slowing them down) without it counting towards the peak, so skip it
+        trace_memory = not args.no_memory and args.workers == 1
+        print(stream_part(args.day, part, path, args.workers, trace_memory, args.chunk_size), flush=True)
+
+
+def add_parser(commands: argparse._SubParsersAction):
+    parser = commands.add_parser("run", help="solve days, reporting time and peak memory for parsing and solving")
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: all)")
+    parser.add_argument("--part", type=int, choices=[1, 2], help="only run this part (default: both)")
+    parser.add_argument("--file", help="input file name within inputs/NN, e.g. test (default: input)")
+    parser.add_argument("--no-memory", action="store_true", help="don't trace memory (tracing slows down allocation-heavy solves)")
+    parser.add_argument("--cache", action="store_true", help="load parsed inputs from the on-disk parse cache, parsing and caching them on a miss")
+    parser.add_argument("--profile", nargs="?", const="time", choices=["time", "memory"], help="report call counts and time (and optionally peak memory) for instrumented hot paths")
+    parser.add_argument("--workers", type=int, default=1, help="solve days and parts in this many processes at once, 0 for one per CPU (default: 1)")
+    parser.set_defaults(handler=run)
+
+    parser = commands.add_parser("stream", help="solve a day line by line from a memory-mapped file, for inputs too big to load at once")
+    parser.add_argument("day", type=int, help="day to run")
+    parser.add_argument("--part", type=int, choices=[1, 2], help="only run this part (default: every part which can be streamed)")
+    parser.add_argument("--file", help="input file name within inputs/NN, e.g. test (default: input)")
+    parser.add_argument("--path", type=Path, help="any input file, e.g. a generated one (overrides --file)")
+    parser.add_argument("--no-memory", action="store_true", help="don't trace memory")
+    parser.add_argument("--workers", type=int, default=1, help="solve chunks of lines in this many processes at once, 0 for one per CPU (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=1 << 22, help="bytes of input per chunk (default: 4MB)")
+    parser.set_defaults(handler=stream)
@@ -0,0 +1,7 @@
+### graph search over int ids: BFS, Dijkstra/A* and longest-path DFS, with pluggable visited sets and state encoders
+from modules.search.bfs import bfs_distances, bfs_layers
+from modules.search.dijkstra import Heuristic, astar, dijkstra
+from modules.search.encode import StateEncoder
+from modules.search.graph import Adjacency, Neighbors, SearchResult, WeightedAdjacency, WeightedNeighbors, build_adjacency, trace_path
+from modules.search.longest import longest_path
+from modules.search.visited import BitVisited, ByteVisited, SetVisited, Visited, visited_backends
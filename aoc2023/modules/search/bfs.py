@@ -0,0 +1,23 @@
+### breadth-first search
+from typing import Iterator
+
+from modules.search.graph import Neighbors
+from modules.search.visited import SetVisited, Visited
+
+
+def bfs_layers(neighbors: Neighbors, starts: list[int], visited: Visited = None) -> Iterator[list[int]]:
+    """
+    Yields each layer of newly reached ids (starts first), one step further out each time, until none are left.
+    Starts are not marked as visited, so add them to visited first unless they may be reached again later.
+    """
+    visited = visited if visited is not None else SetVisited()
+    layer = starts
+    while layer:
+        yield layer
+        layer = visited.expand(layer, neighbors)
+
+def bfs_distances(neighbors: Neighbors, start: int, visited: Visited = None) -> dict[int, int]:
+    """ Steps from the start to every reachable id. """
+    visited = visited if visited is not None else SetVisited()
+    visited.add(start)
+    return {node: dist for (dist, layer) in enumerate(bfs_layers(neighbors, [start], visited)) for node in layer}
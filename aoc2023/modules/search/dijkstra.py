@@ -0,0 +1,57 @@
+### cheapest-path search: Dijkstra, and A* when given a heuristic
+# stale queue entries aren't removed when a node gets cheaper; they're skipped when popped, since the node is already
+# visited by then (cheaper than a decrease-key for int ids, and each push is O(log n))
+from heapq import heappop, heappush
+from typing import Callable
+
+from modules.search.graph import SearchResult, WeightedNeighbors, trace_path
+from modules.search.visited import SetVisited, Visited
+
+type Heuristic = Callable[[int], int]
+
+
+def dijkstra(
+        neighbors: WeightedNeighbors,
+        starts: list[int],
+        is_goal: Callable[[int], bool],
+        heuristic: Heuristic = None,
+        visited: Visited = None,
+        track_path=False,
+    ) -> SearchResult:
+    """
+    Cheapest cost from any start to the first goal. With a heuristic this is A*; the heuristic must never
+    overestimate the remaining cost, or the result may not be the cheapest.
+    """
+    visited = visited if visited is not None else SetVisited()
+    best: dict[int, int] = {}
+    parents: dict[int, int] | None = {} if track_path else None
+    queue: list[tuple[int, int, int]] = []
+    for start in starts:
+        best[start] = 0
+        heappush(queue, (heuristic(start) if heuristic else 0, 0, start))
+    expanded = 0
+    while queue:
+        (_, cost, node) = heappop(queue)
+        if not visited.add(node):
+            continue
+        expanded += 1
+        if is_goal(node):
+            return SearchResult(cost, node, expanded, trace_path(parents, node) if track_path else None)
+        for (step, next) in neighbors(node):
+            new_cost = cost + step
+            if new_cost < best.get(next, new_cost + 1) and next not in visited:
+                best[next] = new_cost
+                if track_path:
+                    parents[next] = node
+                heappush(queue, (new_cost + heuristic(next) if heuristic else new_cost, new_cost, next))
+    return SearchResult(None, None, expanded, None)
+
+def astar(
+        neighbors: WeightedNeighbors,
+        starts: list[int],
+        is_goal: Callable[[int], bool],
+        heuristic: Heuristic,
+        visited: Visited = None,
+        track_path=False,
+    ) -> SearchResult:
+    return dijkstra(neighbors, starts, is_goal, heuristic, visited, track_path)
@@ -0,0 +1,26 @@
+### state encoders: pack multi-part search states into single ints, so queues and visited sets only handle ints
+from math import prod
+
+
+class StateEncoder:
+    """
+    Mixed-radix packing of fixed-size fields, e.g. StateEncoder(cells, 4) packs (cell, dir code) as cell * 4 + dir.
+    Encoded states are dense in range(size), so they can index a ByteVisited or a list.
+    """
+    def __init__(self, *sizes: int):
+        self.sizes = sizes
+        self.size = prod(sizes)
+
+    def encode(self, *fields: int) -> int:
+        state = 0
+        for (field, size) in zip(fields, self.sizes):
+            state = state * size + field
+        return state
+
+    def decode(self, state: int) -> tuple[int, ...]:
+        fields = []
+        for size in reversed(self.sizes[1:]):
+            (state, field) = divmod(state, size)
+            fields.append(field)
+        fields.append(state)
+        return tuple(reversed(fields))
@@ -0,0 +1,31 @@
+### graph shapes shared by the searches
+# nodes are int ids; a graph is either adjacency arrays (adj[id] lists the neighbors of id), or for implicit or
+# unbounded graphs, a function from an id to its neighbors (adjacency arrays work as that function via adj.__getitem__)
+from typing import Callable, Iterable, NamedTuple
+
+type Neighbors = Callable[[int], Iterable[int]]
+type WeightedNeighbors = Callable[[int], Iterable[tuple[int, int]]]   # (cost, neighbor) pairs
+type Adjacency = list[list[int]]
+type WeightedAdjacency = list[list[tuple[int, int]]]
+
+
+class SearchResult(NamedTuple):
+    cost: int | None            # None if the goal couldn't be reached
+    node: int | None            # the goal which was reached
+    expanded: int               # number of nodes expanded, for comparing strategies
+    path: list[int] | None      # ids from start to goal, if the search tracked them
+
+
+def build_adjacency(size: int, edges: Iterable[tuple[int, int]], directed=False) -> Adjacency:
+    adj: Adjacency = [[] for _ in range(size)]
+    for (src, dst) in edges:
+        adj[src].append(dst)
+        if not directed:
+            adj[dst].append(src)
+    return adj
+
+def trace_path(parents: dict[int, int], node: int) -> list[int]:
+    path = [node]
+    while (node := parents.get(node)) is not None:
+        path.append(node)
+    return path[::-1]
@@ -0,0 +1,42 @@
+### longest simple path: depth-first over every path, for small graphs (the path so far is an int bitmask of ids)
+from modules.search.graph import SearchResult, WeightedAdjacency
+
+
+class StopSearch(Exception):
+    pass
+
+
+def longest_path(adj: WeightedAdjacency, start: int, end: int, max_expansions: int = None) -> SearchResult:
+    """
+    Longest path from start to end which visits each id at most once, or the longest found within max_expansions.
+    Prunes a branch once even taking the longest path out of every remaining node couldn't beat the best so far.
+    """
+    longest_out = [max((cost for (cost, _) in edges), default=0) for edges in adj]
+    best = (-1, [])
+    path = [start]
+    expanded = 0
+
+    def walk(node: int, seen: int, cost: int, max_left: int):
+        nonlocal best, expanded
+        expanded += 1
+        if expanded == max_expansions:
+            raise StopSearch()
+        if node == end:
+            if cost > best[0]:
+                best = (cost, path.copy())
+            return
+        max_left -= longest_out[node]
+        for (step, next) in adj[node]:
+            bit = 1 << next
+            if seen & bit or cost + step + max_left <= best[0]:
+                continue
+            path.append(next)
+            walk(next, seen | bit, cost + step, max_left)
+            path.pop()
+
+    try:
+        walk(start, 1 << start, 0, sum(longest_out))
+    except StopSearch:
+        pass
+    (cost, best_path) = best
+    return SearchResult(cost, end, expanded, best_path) if cost >= 0 else SearchResult(None, None, expanded, None)
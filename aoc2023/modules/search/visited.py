@@ -0,0 +1,99 @@
+### visited-set backends
+# all share add (True if the id was new), expand (for a whole BFS layer) and `in`, so searches can swap them freely
+# set: any ids, no size needed (the only option for unbounded graphs)
+# bytes: dense ids below a known size; one byte each, fastest for large graphs
+# bits: dense ids in a single int bitmask; compact and cheap to copy for small graphs
+from typing import Callable, Iterable
+
+
+class SetVisited:
+    def __init__(self, size: int = None):
+        self.seen: set[int] = set()
+
+    def add(self, id: int) -> bool:
+        if id in self.seen:
+            return False
+        self.seen.add(id)
+        return True
+
+    def expand(self, layer: list[int], neighbors: Callable[[int], Iterable[int]]) -> list[int]:
+        """
+        Marks the neighbors of the layer as visited, returning the ones which weren't already (in order, without repeats).
+        Each backend loops over the layer itself, since calling add for every neighbor is most of the cost of a BFS.
+        """
+        (seen, next_layer) = (self.seen, [])
+        for node in layer:
+            for next in neighbors(node):
+                if next not in seen:
+                    seen.add(next)
+                    next_layer.append(next)
+        return next_layer
+
+    def __contains__(self, id: int) -> bool:
+        return id in self.seen
+
+    def __len__(self):
+        return len(self.seen)
+
+
+class ByteVisited:
+    def __init__(self, size: int):
+        self.seen = bytearray(size)
+
+    def add(self, id: int) -> bool:
+        if self.seen[id]:
+            return False
+        self.seen[id] = 1
+        return True
+
+    def expand(self, layer: list[int], neighbors: Callable[[int], Iterable[int]]) -> list[int]:
+        (seen, next_layer) = (self.seen, [])
+        for node in layer:
+            for next in neighbors(node):
+                if not seen[next]:
+                    seen[next] = 1
+                    next_layer.append(next)
+        return next_layer
+
+    def __contains__(self, id: int) -> bool:
+        return self.seen[id] == 1
+
+    def __len__(self):
+        return len(self.seen) - self.seen.count(0)
+
+
+class BitVisited:
+    def __init__(self, size: int = None):
+        self.seen = 0
+
+    def add(self, id: int) -> bool:
+        bit = 1 << id
+        if self.seen & bit:
+            return False
+        self.seen |= bit
+        return True
+
+    def expand(self, layer: list[int], neighbors: Callable[[int], Iterable[int]]) -> list[int]:
+        (seen, next_layer) = (self.seen, [])
+        for node in layer:
+            for next in neighbors(node):
+                if not seen & (bit := 1 << next):
+                    seen |= bit
+                    next_layer.append(next)
+        self.seen = seen
+        return next_layer
+
+    def __contains__(self, id: int) -> bool:
+        return (self.seen >> id) & 1 == 1
+
+    def __len__(self):
+        return self.seen.bit_count()
+
+
+type Visited = SetVisited | ByteVisited | BitVisited
+
+visited_backends: dict[str, Callable[[int], Visited]] = {
+    "set": SetVisited,
+    "bytes": ByteVisited,
+    "bits": BitVisited,
+}
@@ -1,6 +1,5 @@
 # common types
 from enum import Enum
-from heapq import heappop, heappush
 from functools import cached_property
 from typing import Callable, Iterator, NamedTuple
 
@@ -16,6 +15,14 @@ class Loc(NamedTuple):
     def __sub__(self, other: "Loc"):
         return Loc(self.row - other.row, self.col - other.col)
 
+    def pack(self, width: int) -> int:
+        """ Packs into a single int (row * width + col), which is cheaper to hash and compare. Needs 0 <= col < width. """
+        return self.row * width + self.col
+
+    @staticmethod
+    def unpack(packed: int, width: int) -> "Loc":
+        return Loc(*divmod(packed, width))
+
     def __repr__(self):
         return f"(r{self.row}, c{self.col})"
 
@@ -48,6 +55,11 @@ class Dir(Enum):
     def opposite(self):
         return {Dir.left: Dir.right, Dir.right: Dir.left, Dir.up: Dir.down, Dir.down: Dir.up}[self]
 
+    @cached_property
+    def code(self) -> int:
+        """ Integer code (0-3) for indexing the dir_* lookup tables below. """
+        return dirs_by_code.index(self)
+
     def from_loc(self, loc: Loc) -> Loc:
         """ Gets the new location when moving from the Loc. """
         return loc + self.value
@@ -62,24 +74,101 @@ class Dir(Enum):
 
     def __mul__(self, num: int):
         return Loc(self.value.row * num, self.value.col * num)
-        
+
     def __repr__(self):
         return self.name
 
 
+# integer direction codes, for hot loops that would rather index a tuple than hash a Dir
+(left_code, right_code, up_code, down_code) = range(4)
+dirs_by_code: tuple[Dir, ...] = (Dir.left, Dir.right, Dir.up, Dir.down)
+dir_opposite: tuple[int, ...] = (right_code, left_code, down_code, up_code)
+dir_turn_left: tuple[int, ...] = (down_code, up_code, left_code, right_code)
+dir_turn_right: tuple[int, ...] = (up_code, down_code, right_code, left_code)
+
+def dir_offsets(width: int) -> tuple[int, ...]:
+    """ Packed-int offsets for moving one step in each direction (indexed by dir code). """
+    return (-1, 1, -width, width)
+
+
+class Grid:
+    """
+    2d grid of single-character cells, stored flat in one bytearray and addressed by integer index.
+    Rows keep their trailing newline (like find_in_input), so index = row * stride + col, where stride = cols + 1.
+    The newlines double as a border: stepping off the left or right edge lands on one, and stepping off the
+    top or bottom lands outside the buffer, so in_bounds is a single range check plus a byte comparison.
+    """
+    newline = ord("\n")
+
+    def __init__(self, input: str):
+        self.cells = bytearray(input if input.endswith("\n") else input + "\n", "ascii")
+        self.cols = self.cells.index(Grid.newline)
+        self.stride = self.cols + 1
+        self.rows = len(self.cells) // self.stride
+        self.size = len(self.cells)
+        # index offsets for moving one cell in each direction
+        self.neighbor_offsets: tuple[int, ...] = dir_offsets(self.stride)
+        self.offsets: dict[Dir, int] = {dir: self.neighbor_offsets[dir.code] for dir in Dir}
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "Grid":
+        return cls("\n".join(lines))
+
+    def idx(self, row: int, col: int) -> int:
+        return row * self.stride + col
+
+    def idx_of(self, loc: Loc) -> int:
+        return loc.pack(self.stride)
+
+    def loc(self, idx: int) -> Loc:
+        return Loc.unpack(idx, self.stride)
+
+    def find(self, char: str) -> int:
+        return self.cells.index(ord(char))
+
+    def in_bounds(self, idx: int) -> bool:
+        return 0 <= idx < self.size and self.cells[idx] != Grid.newline
+
+    def get(self, idx: int) -> str:
+        return chr(self.cells[idx])
+
+    def set(self, idx: int, char: str):
+        self.cells[idx] = ord(char)
+
+    def get_wrapped(self, row: int, col: int) -> str:
+        """ Gets the cell as though the grid repeats infinitely in every direction. """
+        return chr(self.cells[(row % self.rows) * self.stride + col % self.cols])
+
+    def neighbors(self, idx: int) -> list[int]:
+        """ Indexes of the in-bounds cells next to the cell. """
+        return [n_idx for n_idx in (idx + offset for offset in self.neighbor_offsets) if self.in_bounds(n_idx)]
+
+    def row(self, row: int) -> memoryview:
+        """ Zero-copy view of a row (without its newline). """
+        start = row * self.stride
+        return memoryview(self.cells)[start : start + self.cols]
+
+    def col(self, col: int) -> memoryview:
+        """ Zero-copy view of a column. """
+        return memoryview(self.cells)[col :: self.stride]
+
+    def __str__(self):
+        return self.cells.decode("ascii").rstrip("\n")
+
+
 class Counter:
     """ Counter for assigning unique object ids. """
     def __init__(self, next=1):
         self._next = next
-        self._iter = self.iter()
 
     def next(self):
-        return next(self._iter)
+        res = self._next
+        self._next += 1
+        return res
 
     def iter(self):
         while True:
-            yield self._next
-            self._next += 1
+            yield self.next()
 
 
 
@@ -88,6 +177,7 @@ class KeyedPQ[T, TKey]:
     Priority Queue which tracks the keys of items. When trying to add a new item with the same key as
     another, uses replace_if to determine whether to replace the old item or reject the new item.
     Uses replace_if even when a new item has the same key as an already-popped item.
+    The heap tracks the position of each queued key, so replacing (e.g. decrease-key) and popping are O(log n).
     """
     use_item_as_key: Callable[[T], T] = lambda t: t             # default: use the item itself as the key
     bool_replace: Callable[[T, T], bool] = lambda a, b: True    # default: always replace old items
@@ -101,7 +191,9 @@ class KeyedPQ[T, TKey]:
         self.key = key
         self.replace_if = replace_if
         self.pq: list[T] = []
-        self.items: dict[TKey, T] = {}
+        self.keys: list[TKey] = []              # key of the item at each heap position
+        self.positions: dict[TKey, int] = {}    # heap position of each key still in the queue
+        self.items: dict[TKey, T] = {}          # latest accepted item for each key, including popped ones
         self.add_all(init_items)
 
     def add_all(self, items: list[T]):
@@ -110,20 +202,64 @@ class KeyedPQ[T, TKey]:
 
     def add(self, item: T) -> bool:
         item_key = self.key(item)
-        do_add = True
-        # replace old item in the queue if replace_if is True and the old item is not already popped
-        if item_key in self.items and (do_add := self.replace_if((existing := self.items[item_key]), item)) and existing in self.pq:
-            self.pq.remove(existing)
         # if replace_if was False, reject the new item
-        if do_add:
-            heappush(self.pq, item)
-            self.items[item_key] = item
-        return do_add
+        if item_key in self.items and not self.replace_if(self.items[item_key], item):
+            return False
+        self.items[item_key] = item
+        # replace old item in the queue in place if it is not already popped
+        if (pos := self.positions.get(item_key)) is not None:
+            self.pq[pos] = item
+            self._sift_up(pos)
+            self._sift_down(self.positions[item_key])
+        else:
+            self.pq.append(item)
+            self.keys.append(item_key)
+            self.positions[item_key] = len(self.pq) - 1
+            self._sift_up(len(self.pq) - 1)
+        return True
 
     def pop(self) -> T:
-        item = heappop(self.pq)
+        (pq, keys) = (self.pq, self.keys)
+        item = pq[0]
+        del self.positions[keys[0]]
+        (last, last_key) = (pq.pop(), keys.pop())
+        if pq:
+            (pq[0], keys[0]) = (last, last_key)
+            self.positions[last_key] = 0
+            self._sift_down(0)
         return item
 
+    def _sift_up(self, pos: int):
+        (pq, keys, positions) = (self.pq, self.keys, self.positions)
+        (item, item_key) = (pq[pos], keys[pos])
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            if not item < pq[parent]:
+                break
+            (pq[pos], keys[pos]) = (pq[parent], keys[parent])
+            positions[keys[pos]] = pos
+            pos = parent
+        (pq[pos], keys[pos]) = (item, item_key)
+        positions[item_key] = pos
+
+    def _sift_down(self, pos: int):
+        (pq, keys, positions) = (self.pq, self.keys, self.positions)
+        (item, item_key) = (pq[pos], keys[pos])
+        end = len(pq)
+        while (child := 2 * pos + 1) < end:
+            if child + 1 < end and pq[child + 1] < pq[child]:
+                child += 1
+            if not pq[child] < item:
+                break
+            (pq[pos], keys[pos]) = (pq[child], keys[child])
+            positions[keys[pos]] = pos
+            pos = child
+        (pq[pos], keys[pos]) = (item, item_key)
+        positions[item_key] = pos
+
+    def __len__(self):
+        return len(self.pq)
+
     def iter(self) -> Iterator[T]:
         while self.pq:
             yield self.pop()
@@ -1,26 +1,110 @@
 # day 1: number word parsing
-import re
+from collections import deque
+from functools import partial
 from modules.parse import get_input
-from modules.utils import rev
+from modules.registry import LineSolver, Solver
 
 nums = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9}
-nums_rev = {rev(k): v for (k,v) in nums.items()}
+digits = {str(num): num for num in range(10)}
+newline = ord("\n")
 
-def get_first(line, parse_nums):
-    numstr = f"|{('|').join(list(nums))}" if parse_nums else ""
-    res = re.search(rf"([\d]{numstr})", line, flags=re.ASCII).group(0)
-    return nums.get(res) or int(res)
+class DigitScanner:
+    """
+    Aho-Corasick automaton over the digit patterns, flattened into a DFA: one table lookup per byte finds every
+    (possibly overlapping) match in a single forward pass, so the last digit is just the last match - no reversing.
+    """
+    def __init__(self, patterns: dict[str, int]):
+        # goto[state * 256 + byte] is the next state; value[state] is the digit matched on reaching it (or -1)
+        trie: list[dict[int, int]] = [{}]
+        value = [-1]
+        for (pattern, num) in patterns.items():
+            state = 0
+            for byte in pattern.encode("ascii"):
+                if byte not in trie[state]:
+                    trie[state][byte] = len(trie)
+                    trie.append({})
+                    value.append(-1)
+                state = trie[state][byte]
+            value[state] = num
 
-def get_last(line, parse_nums):
-    numstr = f"|{('|').join(list(nums_rev))}" if parse_nums else ""
-    res = re.search(rf"([\d]{numstr})", rev(line), flags=re.ASCII).group(0)
-    return nums_rev.get(res) or int(res)
+        # breadth-first, so each state's failure (longest proper suffix which is also a trie path) is already built
+        goto = [0] * (len(trie) * 256)
+        fail = [0] * len(trie)
+        for (byte, child) in trie[0].items():
+            goto[byte] = child
+        queue = deque(trie[0].values())
+        while queue:
+            state = queue.popleft()
+            if value[state] < 0:
+                value[state] = value[fail[state]]
+            for byte in range(256):
+                if (child := trie[state].get(byte)) is not None:
+                    fail[child] = goto[fail[state] * 256 + byte]
+                    goto[state * 256 + byte] = child
+                    queue.append(child)
+                else:
+                    goto[state * 256 + byte] = goto[fail[state] * 256 + byte]
+        (self.goto, self.value) = (goto, value)
+
+    def scan_line(self, line: bytes) -> tuple[int, int]:
+        """ First and last digit in the line, or (-1, -1) if it has none. """
+        (goto, value) = (self.goto, self.value)
+        (state, first, last) = (0, -1, -1)
+        for byte in line:
+            state = goto[state << 8 | byte]
+            if (num := value[state]) >= 0:
+                if first < 0:
+                    first = num
+                last = num
+        return (first, last)
+
+    def sum_buffer(self, buffer: bytes) -> int:
+        """ Sum of the calibration values of every line in the buffer, in one pass without splitting it into lines. """
+        (goto, value) = (self.goto, self.value)
+        (state, first, last, total) = (0, -1, -1, 0)
+        for byte in buffer:
+            if byte == newline:
+                if first >= 0:
+                    total += 10 * first + last
+                (state, first) = (0, -1)
+                continue
+            state = goto[state << 8 | byte]
+            if (num := value[state]) >= 0:
+                if first < 0:
+                    first = num
+                last = num
+        if first >= 0:
+            total += 10 * first + last
+        return total
+
+scanners = {False: DigitScanner(digits), True: DigitScanner(digits | nums)}
+
+def parse_input(input: str) -> bytes:
+    return input.encode("ascii")
+
+def get_calibration(line: str, parse_nums=False) -> int:
+    (first, last) = scanners[parse_nums].scan_line(line.encode("ascii"))
+    # a line without digits adds nothing, the same as in sum_buffer
+    return 10 * first + last if first >= 0 else 0
+
+def sum_calibrations(buffer: bytes, parse_nums=False) -> int:
+    return scanners[parse_nums].sum_buffer(buffer)
 
 def process_input(input, parse_nums=False):
-    res = [10 * get_first(line, parse_nums) + get_last(line, parse_nums) for line in input.splitlines()]
-    return sum(res)
+    return sum_calibrations(parse_input(input), parse_nums)
+
+solvers = {
+    1: Solver(parse_input, sum_calibrations),
+    2: Solver(parse_input, partial(sum_calibrations, parse_nums=True)),
+}
+
+line_solvers = {
+    1: LineSolver(get_calibration, solve_chunk=sum_calibrations),
+    2: LineSolver(partial(get_calibration, parse_nums=True), solve_chunk=partial(sum_calibrations, parse_nums=True)),
+}
 
-# process_input(get_input(1, file="test_1"))
-# process_input(get_input(1))
-# process_input(get_input(1, file="test_2"), True)
-process_input(get_input(1), True)
\ No newline at end of file
+if __name__ == "__main__":
+    # process_input(get_input(1, file="test_1"))
+    # process_input(get_input(1))
+    # process_input(get_input(1, file="test_2"), True)
+    process_input(get_input(1), True)
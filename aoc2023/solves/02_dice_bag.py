@@ -1,48 +1,81 @@
 # day 2: dice bag
-from typing import NamedTuple
+import re
+from array import array
+from functools import partial
+from modules.array_math import group_max
 from modules.parse import get_input
+from modules.registry import LineSolver, Solver
 
+colors = ("red", "green", "blue")
 # only 12 red cubes, 13 green cubes, and 14 blue cubes
-dice = {"red": 12, "green": 13, "blue": 14}
-
-class Game(NamedTuple):
-    num: int
-    rounds: list[dict[str, int]]
-
-def parse_game(line):
-    (game_num, rounds) = line.split(": ")
-    game_num = int(game_num.replace("Game ", ""))
-    rounds = [{(cnsplit := color_num.split(" "))[1]: int(cnsplit[0]) for color_num in round.split(", ")} for round in rounds.split("; ")]
-    return Game(game_num, rounds)
-
-# 2-1
-def validate_game(game: Game):
-    for round in game.rounds:
-        for (color, num) in round.items():
-            if num > dice[color]:
-                return 0
-    return game.num
-
-# 2-2
-def get_power(game: Game):
-    min = {"red": 0, "green": 0, "blue": 0}
-    for round in game.rounds:
-        for (color, num) in round.items():
-            min[color] = max(num, min[color])
-    return min["red"] * min["green"] * min["blue"]
-
-
-def parse_input(input):
-    return [parse_game(line) for line in input.splitlines()]
+dice = (12, 13, 14)
+
+class GameTable:
+    """
+    Columnar games: one row per round (game id, round id, then a column per color), read straight from the text.
+    Each game's max of each color is reduced once up front, so any number of bag limits can be checked without re-parsing.
+    """
+    def __init__(self, input: str):
+        self.game = array("q")
+        self.round = array("q")
+        self.cubes = {color: array("q") for color in colors}
+        # a ";" or a new game ends the current round; every round starts with zero of each color
+        for (game_num, sep, num, color) in re.findall(r"Game (\d+)|(;)|(\d+) (\w+)", input):
+            if game_num or sep:
+                if game_num:
+                    (game, round) = (int(game_num), 0)
+                else:
+                    round += 1
+                self.game.append(game)
+                self.round.append(round)
+                for column in self.cubes.values():
+                    column.append(0)
+            else:
+                self.cubes[color][-1] = int(num)
+        # grouped max-reduction of each color column by game
+        grouped = {color: group_max(self.game, column) for (color, column) in self.cubes.items()}
+        self.ids = array("q", grouped["red"][0])
+        self.max = {color: array("q", maxes) for (color, (_, maxes)) in grouped.items()}
+
+    def sum_possible(self, limits: tuple[int, ...] = dice) -> int:
+        """ Sum of the ids of games which are possible with the given number of each color (in colors order). """
+        (red, green, blue) = limits
+        return sum(id for (id, r, g, b) in zip(self.ids, *self.max.values()) if r <= red and g <= green and b <= blue)
+
+    def sum_possible_many(self, limits: list[tuple[int, ...]]) -> list[int]:
+        return [self.sum_possible(limit) for limit in limits]
+
+    def sum_powers(self) -> int:
+        """ Sum over games of the product of the fewest cubes of each color which make the game possible. """
+        return sum(r * g * b for (r, g, b) in zip(*self.max.values()))
+
+def parse_input(input: str) -> GameTable:
+    return GameTable(input)
+
+def sum_games(games: GameTable, find_power=False):
+    return games.sum_powers() if find_power else games.sum_possible()
+
+def score_line(line: str, find_power=False) -> int:
+    return sum_games(GameTable(line), find_power)
+
+def score_chunk(chunk: bytes, find_power=False) -> int:
+    return sum_games(GameTable(chunk.decode()), find_power)
 
 def process_input(input, find_power=False):
-    games = parse_input(input)
-    if find_power:
-        return sum([get_power(game) for game in games])
-    else:
-        return sum([validate_game(game) for game in games])
-
-# process_input(get_input(2, True))
-# process_input(get_input(2))
-# process_input(get_input(2, True), True)
-process_input(get_input(2), True)
\ No newline at end of file
+    return sum_games(parse_input(input), find_power)
+
+solvers = {
+    1: Solver(parse_input, sum_games),
+    2: Solver(parse_input, partial(sum_games, find_power=True)),
+}
+
+line_solvers = {
+    1: LineSolver(score_line, solve_chunk=score_chunk),
+    2: LineSolver(partial(score_line, find_power=True), solve_chunk=partial(score_chunk, find_power=True)),
+}
+
+if __name__ == "__main__":
+    # process_input(get_input(2, True))
+    # process_input(get_input(2))
+    # process_input(get_input(2, True), True)
+    process_input(get_input(2), True)
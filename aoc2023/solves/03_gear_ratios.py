@@ -1,61 +1,86 @@
 # day 3: gear ratios
 import re
+from bisect import bisect_right
+from typing import NamedTuple
 from modules.parse import get_input
+from modules.registry import Solver
+from modules.types import Grid, Loc
+
+class Number(NamedTuple):
+    row: int
+    start: int      # first column
+    end: int        # column after the last digit
+    value: int
+
+class Schematic:
+    """
+    Spatial index over the schematic: numbers bucketed by row (sorted by start column, so a column range is a bisect),
+    and a bitmap laid out like the grid marking every cell next to a symbol, so checking a number is one slice of it.
+    """
+    def __init__(self, grid: Grid):
+        self.rows = grid.rows
+        self.numbers: list[list[Number]] = [[] for _ in range(grid.rows)]
+        for m in re.finditer(rb"\d+", grid.cells):
+            (row, col) = divmod(m.start(), grid.stride)
+            self.numbers[row].append(Number(row, col, col + len(m.group()), int(m.group())))
+        self.starts: list[list[int]] = [[num.start for num in row] for row in self.numbers]
+        self.stars: list[Loc] = [grid.loc(m.start()) for m in re.finditer(rb"\*", grid.cells)]
+        self.stride = grid.stride
+        self.near_symbol = self.get_near_symbol(grid)
+
+    def get_near_symbol(self, grid: Grid) -> bytearray:
+        # a symbol in the first or last column spills onto the newline border, which no number ever covers
+        near = bytearray(grid.size)
+        for m in re.finditer(rb"[^\d\.\n]", grid.cells):
+            for offset in (-grid.stride, 0, grid.stride):
+                (lo, hi) = (max(m.start() + offset - 1, 0), min(m.start() + offset + 2, grid.size))
+                near[lo:hi] = b"\x01" * max(hi - lo, 0)
+        return near
+
+    def is_part(self, num: Number) -> bool:
+        start = num.row * self.stride
+        return any(self.near_symbol[start + num.start : start + num.end])
+
+    def get_adjacent(self, loc: Loc) -> list[Number]:
+        adjacent = []
+        for row in range(max(loc.row - 1, 0), min(loc.row + 2, self.rows)):
+            (numbers, starts) = (self.numbers[row], self.starts[row])
+            # numbers starting at or before the next column, walking back while they still reach the previous column
+            idx = bisect_right(starts, loc.col + 1) - 1
+            while idx >= 0 and numbers[idx].end >= loc.col:
+                adjacent.append(numbers[idx])
+                idx -= 1
+        return adjacent
 
 # 3-1
-def find_numbers(input):
-    res = []
-    for (idx, row) in enumerate(input):
-        checks = re.finditer(r"[\d]+", row)
-        res += [(idx, *m.span(0), int(m.group(0))) for m in checks]
-    return res
-
-def check_if_part(input, rownum, start, end, num):
-    col_start = max(start - 1, 0)
-    col_end = min(end + 1, len(input[0]))
-    row_start = max(rownum - 1, 0)
-    row_end = min(rownum + 1, len(input) - 1)
-    check = "".join([input[row][col_start:col_end] for row in range(row_start, row_end + 1)])
-    return num if re.search(r"[^\d\.]", check) else None
-
-def find_parts(input):
-    res = find_numbers(input)
-    res = [check_if_part(input, *check) for check in res]
-    res = [part for part in res if part]
-    res = sum(res)
-    return res
+def find_parts(schematic: Schematic):
+    return sum(num.value for row in schematic.numbers for num in row if schematic.is_part(num))
 
 # 3-2
-def find_stars(input):
-    res = []
-    for (idx, row) in enumerate(input):
-        checks = re.finditer(r"\*", row)
-        res += [(idx, m.span(0)[0]) for m in checks]
-    return res
-
-def check_if_gear(star, nums):
-    res = [num[3] for num in nums
-        if star[0]-1 <= num[0] <= star[0]+1
-        and num[1] <= star[1]+1
-        and num[2] >= star[1]]
-    return res[0]*res[1] if len(res) == 2 else None
-    
-def find_gears(input):
-    nums = find_numbers(input)
-    stars = find_stars(input)
-    res = [check_if_gear(star, nums) for star in stars]
-    res = [gear for gear in res if gear]
-    res = sum(res)
-    return res
+def get_gear_ratio(schematic: Schematic, star: Loc) -> int:
+    nums = schematic.get_adjacent(star)
+    return nums[0].value * nums[1].value if len(nums) == 2 else 0
+
+def find_gears(schematic: Schematic):
+    return sum(get_gear_ratio(schematic, star) for star in schematic.stars)
+
+def parse_input(input) -> Schematic:
+    return Schematic(Grid(input))
 
 def process_input(input, gears=False):
-    input = input.splitlines()
+    schematic = parse_input(input)
     if gears:
-        return find_gears(input)
+        return find_gears(schematic)
     else:
-        return find_parts(input)
+        return find_parts(schematic)
+
+solvers = {
+    1: Solver(parse_input, find_parts),
+    2: Solver(parse_input, find_gears),
+}
 
-# process_input(get_input(3, True))
-# process_input(get_input(3))
-# process_input(get_input(3, True), True)
-process_input(get_input(3), True)
\ No newline at end of file
+if __name__ == "__main__":
+    # process_input(get_input(3, True))
+    # process_input(get_input(3))
+    # process_input(get_input(3, True), True)
+    process_input(get_input(3), True)
@@ -1,34 +1,67 @@
 # day 4: scratch-off tickets
-from math import pow
-from modules.array_math import add
+from collections import deque
+from typing import Iterable
 from modules.parse import get_input
+from modules.registry import LineSolver, Solver
+
+# numbers are all below 100, so each side of a card fits in an int bitmask, and matches are the bits set in both
+def to_mask(nums: str) -> int:
+    mask = 0
+    for num in nums.split():
+        mask |= 1 << int(num)
+    return mask
+
+def card_matches(card: str) -> int:
+    (wins, yours) = card.split(": ")[1].split(" | ")
+    return (to_mask(wins) & to_mask(yours)).bit_count()
 
 # 4-1
-def card_matches(card: str):
-    parts = card.split(": ")[1].split(" | ")
-    yours = set([num for num in parts[1].split(" ")])
-    wins = [num for num in parts[0].split(" ") if num in yours]
-    return len(wins)
+def score_card(matches: int) -> int:
+    return 1 << (matches - 1) if matches else 0
+
+def score_line(line: str):
+    return score_card(card_matches(line))
 
-def score_card(card: str):
-    return int(pow(2, card_matches(card) - 1))
+def score_cards(cards: list[int]):
+    return sum([score_card(matches) for matches in cards])
 
 # 4-2
-def total_cards(cards: list[str]):
-    res = [1] * len(cards)
-    for (idx, card) in enumerate(cards):
-        matches = card_matches(card)
-        res[idx+1:idx+matches+1] = add(res[idx+1:idx+matches+1], res[idx])
-    return sum(res)
+def total_cards(cards: Iterable[int]):
+    # difference array over the cards ahead (diff[0] is the change in copies at the next card), so instead of adding
+    # a card's copies to each of the cards it wins, it's added once at the first and taken away after the last
+    (total, extra, diff) = (0, 0, deque())
+    for matches in cards:
+        extra += diff.popleft() if diff else 0
+        copies = 1 + extra
+        total += copies
+        if matches:
+            diff.extend([0] * (matches + 1 - len(diff)))
+            diff[0] += copies
+            diff[matches] -= copies
+    return total
+
+def parse_input(input) -> list[int]:
+    return [card_matches(card) for card in input.splitlines()]
 
 def process_input(input, total=False):
-    cards = input.replace("  ", " 0").splitlines()
+    cards = parse_input(input)
     if total:
         return total_cards(cards)
     else:
-        return sum([score_card(card) for card in cards])
+        return score_cards(cards)
+
+solvers = {
+    1: Solver(parse_input, score_cards),
+    2: Solver(parse_input, total_cards),
+}
+
+# part 2 isn't independent per line (each card wins copies of the cards after it), so only part 1 can be streamed
+line_solvers = {
+    1: LineSolver(score_line),
+}
 
-# process_input(get_input(4, test=True))
-# process_input(get_input(4))
-# process_input(get_input(4, test=True), total=True)
-process_input(get_input(4), total=True)
\ No newline at end of file
+if __name__ == "__main__":
+    # process_input(get_input(4, test=True))
+    # process_input(get_input(4))
+    # process_input(get_input(4, test=True), total=True)
+    process_input(get_input(4), total=True)
@@ -1,21 +1,125 @@
 # day 5: seed plots
+from array import array
+from bisect import bisect_right
+from functools import partial
 from itertools import batched
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
 from modules.parse import get_input
+from modules.registry import Solver
+
+# end of the last piece of a composed mapping; plots are never this large
+unbounded = 1 << 64
 
 class Mapping(NamedTuple):
     dst: int
     src: int
     length: int
 
-class Almanac(NamedTuple):
-    seeds: list[int]
-    mappings: list[list[Mapping]]
-
 class Range(NamedTuple):
     start: int
     end: int
 
+class Piece(NamedTuple):
+    start: int
+    end: int        # exclusive
+    shift: int      # added to any plot in [start, end)
+
+class Piecewise:
+    """
+    One or more mapping layers composed into a single piecewise shift. The pieces are sorted and cover every plot
+    from 0 up (plots outside every mapping just get a shift of 0), so any plot is in exactly one piece.
+    """
+    def __init__(self, pieces: list[Piece]):
+        self.pieces = pieces
+        self.starts = [piece.start for piece in pieces]
+        self.shifts = [piece.shift for piece in pieces]
+
+    @staticmethod
+    def from_layer(mappings: list[Mapping]) -> "Piecewise":
+        pieces = []
+        prev_end = 0
+        for (dst, src, length) in sorted(mappings, key=lambda m: m.src):
+            if src > prev_end:
+                pieces.append(Piece(prev_end, src, 0))
+            pieces.append(Piece(src, src + length, dst - src))
+            prev_end = src + length
+        pieces.append(Piece(prev_end, unbounded, 0))
+        return Piecewise(pieces)
+
+    def get_piece_idx(self, plot: int) -> int:
+        return bisect_right(self.starts, plot) - 1
+
+    def map_plot(self, plot: int) -> int:
+        return plot + self.pieces[self.get_piece_idx(plot)].shift
+
+    def then(self, other: "Piecewise") -> "Piecewise":
+        """ This mapping followed by the other: each piece's image is split wherever the other's pieces change. """
+        composed: list[Piece] = []
+        for (start, end, shift) in self.pieces:
+            idx = other.get_piece_idx(start + shift)
+            while idx < len(other.pieces) and (piece := other.pieces[idx]).start < end + shift:
+                (lo, hi) = (max(start, piece.start - shift), min(end, piece.end - shift))
+                # neighboring pieces with the same total shift are merged
+                if composed and composed[-1].shift == shift + piece.shift and composed[-1].end == lo:
+                    composed[-1] = Piece(composed[-1].start, hi, composed[-1].shift)
+                else:
+                    composed.append(Piece(lo, hi, shift + piece.shift))
+                idx += 1
+        return Piecewise(composed)
+
+    def min_over(self, plots: Range) -> int:
+        """ Lowest mapped plot in the (inclusive) range; each piece only shifts, so its lowest plot is its first. """
+        idx = self.get_piece_idx(plots.start)
+        lowest = None
+        while idx < len(self.pieces) and (piece := self.pieces[idx]).start <= plots.end:
+            mapped = max(plots.start, piece.start) + piece.shift
+            lowest = mapped if lowest is None else min(lowest, mapped)
+            idx += 1
+        return lowest
+
+    def map_plots(self, plots: Iterable[int]) -> array:
+        """
+        Maps a whole batch of plots (in the same order) into a packed array, one bisect over the piece starts each.
+        (Sorting the plots to merge them with the pieces in one pass costs more than the bisects save.)
+        """
+        (starts, shifts) = (self.starts, self.shifts)
+        return array("q", [plot + shifts[bisect_right(starts, plot) - 1] for plot in plots])
+
+    def min_over_ranges(self, ranges: Iterable[Range]) -> int:
+        """
+        Lowest mapped plot over many (inclusive) ranges, in a single pass over the pieces: overlapping ranges are
+        merged first, then each piece only needs the first plot of each range it overlaps.
+        """
+        merged: list[Range] = []
+        for (start, end) in sorted(ranges):
+            if merged and start <= merged[-1].end + 1:
+                merged[-1] = Range(merged[-1].start, max(end, merged[-1].end))
+            else:
+                merged.append(Range(start, end))
+        (pieces, idx) = (self.pieces, 0)
+        lowest = None
+        for (start, end) in merged:
+            while pieces[idx].end <= start:
+                idx += 1
+            while idx < len(pieces) and pieces[idx].start <= end:
+                mapped = max(start, pieces[idx].start) + pieces[idx].shift
+                lowest = mapped if lowest is None else min(lowest, mapped)
+                idx += 1
+            # the last piece may carry on into the next range
+            idx -= 1
+        return lowest
+
+def compose(all_mappings: list[list[Mapping]]) -> Piecewise:
+    composed = Piecewise([Piece(0, unbounded, 0)])
+    for mappings in all_mappings:
+        composed = composed.then(Piecewise.from_layer(mappings))
+    return composed
+
+class Almanac(NamedTuple):
+    seeds: list[int]
+    mappings: list[list[Mapping]]
+    composed: Piecewise     # every mapping layer in one, so lookups don't depend on the number of layers
+
 # 5-1
 def map_single_plot(plot: int, mappings: list[Mapping]) -> int:
     for (dst, src, length) in mappings:
@@ -23,41 +127,10 @@ def map_single_plot(plot: int, mappings: list[Mapping]) -> int:
             return plot+dst-src
     return plot
 
-def apply_mapping(plots: list, mappings: list[Mapping], plotter: callable):
-    res = [plotter(plot, mappings) for plot in plots]
-    if type(res[0]) == int:
-        return res
-    return [plot for subplot in res for plot in subplot]
-
-def map_seeds(seeds: list, all_mappings: list[list[Mapping]], plotter: callable):
-    mapped = seeds
-    for mappings in all_mappings:
-        mapped = apply_mapping(mapped, mappings, plotter)
-    return min(mapped)
-
 # 5-2
 def expand_seeds(seed_map) -> list[Range]:
     return [Range(start, start+num-1) for (start, num) in batched(seed_map, 2)]
 
-def map_plot_range(plot_range: Range, mappings: list[Mapping]) -> list[Range]:
-    unmapped = [plot_range]
-    mapped: list[Range] = []
-
-    for (dst, src_start, length) in mappings:
-        src_end = src_start + length - 1
-        for plot in unmapped:
-            if (plot.start <= src_end) and (src_start <= plot.end):
-                unmapped.remove(plot)
-                overlap_start = max(plot.start, src_start)
-                overlap_end = min(plot.end, src_end)
-                shift = dst - src_start
-                mapped.append(Range(overlap_start + shift, overlap_end + shift))
-                if overlap_start > plot.start:
-                    unmapped.append(Range(plot.start, overlap_start - 1))
-                if overlap_end < plot[1]:
-                    unmapped.append(Range(overlap_end + 1, plot.end))
-    return unmapped + mapped
-
 
 def parse_input(input: str) -> Almanac:
     parts = input.split("\n\n")
@@ -65,18 +138,23 @@ def parse_input(input: str) -> Almanac:
     (seeds, mappings) = (parts[0], [map.splitlines()[1:] for map in parts[1:]])
     seeds = [int(seed) for seed in seeds.split(' ')[1:]]
     mappings = [[Mapping(*[int(num) for num in line.split(" ")]) for line in mapping] for mapping in mappings]
-    return Almanac(seeds, mappings)
+    return Almanac(seeds, mappings, compose(mappings))
+
+def find_lowest(almanac: Almanac, expanded=False):
+    if expanded:
+        return almanac.composed.min_over_ranges(expand_seeds(almanac.seeds))
+    return min(almanac.composed.map_plots(almanac.seeds))
 
 def process_input(input: str, expanded=False):
-    almanac = parse_input(input)
-    (plotter, seeder) = (map_plot_range, expand_seeds) if expanded else (map_single_plot, None)
-    seeds = almanac.seeds
-    if seeder:
-        seeds = seeder(seeds)
-    mapped = map_seeds(seeds, almanac.mappings, plotter)
-    return mapped if type(mapped) == int else min(mapped)
-
-# assert process_input(get_input(5, test=True)) == 35
-# process_input(get_input(5))
-# assert process_input(get_input(5, test=True), expanded=True) == 46
-process_input(get_input(5), expanded=True)
+    return find_lowest(parse_input(input), expanded)
+
+solvers = {
+    1: Solver(parse_input, find_lowest),
+    2: Solver(parse_input, partial(find_lowest, expanded=True)),
+}
+
+if __name__ == "__main__":
+    # assert process_input(get_input(5, test=True)) == 35
+    # process_input(get_input(5))
+    # assert process_input(get_input(5, test=True), expanded=True) == 46
+    process_input(get_input(5), expanded=True)
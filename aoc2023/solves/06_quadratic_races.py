@@ -1,9 +1,11 @@
 # day 6: quadratic races
 import re
-from math import ceil
+from functools import partial
+from math import isqrt
+from typing import Iterable
 from modules.array_math import product
 from modules.parse import get_input
-from modules.utils import quad
+from modules.registry import Solver
 
 # 6-1
 """
@@ -13,29 +15,51 @@ from modules.utils import quad
          = t * (time - t)
     dist = t * time - t^2
        0 = -t^2 + t*time - dist, use quadratic formula to solve for t
+         t = (time +- sqrt(time^2 - 4*dist)) / 2
+    the wins are symmetric (t and time - t go equally far), so only the lowest winning t is needed
+    isqrt keeps it exact for any size of int, where float sqrt loses the last digits past 2^53
 """
 def get_wins(time: int, dist: int) -> int:
-    (t_min, t_max) = quad(-1, time, -dist)
-    # next integer value greater than t_min (race is a tie if t_min is already an int)
-    t_min = ceil(t_min) if ceil(t_min) > t_min else ceil(t_min) + 1
-    t_max = time - t_min
-    return t_max - t_min + 1
+    disc = time*time - 4*dist
+    if disc <= 0:
+        # never goes further than the record (or only ties it at time / 2)
+        return 0
+    # floor of the lower root is within one of the lowest winning t; step up past it if it only ties or loses
+    t_min = (time - isqrt(disc)) // 2
+    while t_min * (time - t_min) <= dist and t_min <= time // 2:
+        t_min += 1
+    return max(time - 2*t_min + 1, 0)
+
+def get_wins_many(times: Iterable[int], dists: Iterable[int]) -> list[int]:
+    """ Wins for each (time, dist) pair of two parallel sequences. """
+    return [get_wins(time, dist) for (time, dist) in zip(times, dists)]
 
 def parse_line(line: str) -> list[int]:
     return [int(num) for num in re.split(r"[ ]+", line)[1:]]
         
+def parse_input(input: str, parser: callable) -> list[tuple[int, int]]:
+    times, dists = [parser(line) for line in input.splitlines()]
+    return list(zip(times, dists))
+
+def multiply_wins(races: list[tuple[int, int]]) -> int:
+    (times, dists) = zip(*races)
+    return product(get_wins_many(times, dists))
+
 def process_input(input: str, parser: callable):
-    input = input.splitlines()
-    times, dists = [parser(line) for line in input]
-    wins = [get_wins(time, dist) for (time, dist) in zip(times, dists)]
-    return product(wins) 
+    return multiply_wins(parse_input(input, parser))
 
 # 6-2
 def parse_kerning(line: str) -> list[int]:
     line = line.replace(" ","")
     return [int(line.split(":")[1])]
 
-# process_input(get_input(6, test=True), parse_line)
-# process_input(get_input(6), parse_line)
-# process_input(get_input(6, test=True), parse_kerning)
-process_input(get_input(6), parse_kerning)
\ No newline at end of file
+solvers = {
+    1: Solver(partial(parse_input, parser=parse_line), multiply_wins),
+    2: Solver(partial(parse_input, parser=parse_kerning), multiply_wins),
+}
+
+if __name__ == "__main__":
+    # process_input(get_input(6, test=True), parse_line)
+    # process_input(get_input(6), parse_line)
+    # process_input(get_input(6, test=True), parse_kerning)
+    process_input(get_input(6), parse_kerning)
@@ -1,68 +1,62 @@
 # day 7: camel poker
+from functools import partial
+from typing import Iterator, NamedTuple
 from modules.parse import get_input
+from modules.registry import Solver
 
 hand_rank = ["highcard", "1pair", "2pair", "3kind", "fullhouse", "4kind", "5kind"]
-card_rank = "123456789VWXYZ"
+# (size of the largest group of matching cards, size of the second largest) to the hand's index in hand_rank
+hand_groups = {(1, 1): 0, (2, 1): 1, (2, 2): 2, (3, 1): 3, (3, 2): 4, (4, 1): 5, (5, 0): 6}
+# each card's rank as one hex digit (a 4-bit value), with jokers wild below all the rest
+card_digits = {False: str.maketrans("23456789TJQKA", "23456789abcde"), True: str.maketrans("23456789TJQKA", "23456789a1cde")}
 
-# sorts by number of cards of a type, then the type's rank
-def sort_hand(input_hand):
-    cards = {}
-    jokers = 0
-    for card in input_hand:
-        cards[card] = cards.get(card, 0) + 1
-    if cards.get("1") and len(cards) > 1:
-        jokers = cards["1"]
-        cards.pop("1")
-    cards = [group for group in cards.items()]
-    cards = sorted(cards, key=lambda group: card_rank.index(group[0]), reverse=True)
-    cards = sorted(cards, key=lambda group: group[1], reverse=True)
-    res = ""
-    # add jokers to the largest group
-    if jokers > 0:
-        res += cards[0][0] * jokers
-    for group in cards:
-        res += group[0] * group[1]
-    return res
+def partitions(num: int, most: int = 5) -> Iterator[tuple[int, ...]]:
+    """ Ways to split num cards into groups of at most `most`, largest first. """
+    if num == 0:
+        yield ()
+    for size in range(min(num, most), 0, -1):
+        for rest in partitions(num - size, size):
+            yield (size, *rest)
 
-def hand_type(input_hand):
-    hand = sort_hand(input_hand)
-    if hand[0] == hand[4]:
-        return "5kind"
-    if hand[0] == hand[3]:
-        return "4kind"
-    if hand[0] == hand[2] and hand[3] == hand[4]:
-        return "fullhouse"
-    if hand[0] == hand[2]:
-        return "3kind"
-    if hand[0] == hand[1] and hand[2] == hand[3]:
-        return "2pair"
-    if hand[0] == hand[1]:
-        return "1pair"    
-    return "highcard"
+# (sum over the non-joker cards of how many match each card, number of jokers) to the hand's index in hand_rank
+# the sum is the sum of squares of the group sizes, which is different for each way of grouping the same number of cards
+# jokers join the largest group (or are all five, which is the same as one group of five)
+hand_types = {
+    (sum(size*size for size in groups), 5 - num): hand_groups[(groups[0] + 5 - num, groups[1])]
+    for num in range(6) for groups in [(*group_sizes, 0, 0) for group_sizes in partitions(num)]
+}
 
-def process_line(line):
-    parts = line.split(" ")
-    return (parts[0], int(parts[1]))
+class Camels(NamedTuple):
+    """ One column per field, so ranking only touches plain lists of ints. """
+    keys: list[int]     # sort in rank order: hand_rank index, then each card's rank as a nibble, first card highest
+    bids: list[int]
 
-def rank_hands(all_hands):
-    # lex sort, lower-ranked cards first
-    res = sorted(all_hands)
-    res = [(hand, hand_rank.index(hand_type(hand))) for hand in res]
-    # hand-rank sort, lower-ranked hands first
-    res = sorted(res, key=lambda hand: hand[1])
-    # print(res)
-    return [hand[0] for hand in res]
+def hand_key(hand: str, jokers_wild=False) -> int:
+    """ The hand's type and then its cards, packed into one int, so hands compare with a single int comparison. """
+    cards = hand.replace("J", "") if jokers_wild else hand
+    type = hand_types[(sum(map(cards.count, cards)), 5 - len(cards))]
+    return int(hand.translate(card_digits[jokers_wild]), 16) | type << 20
+
+def parse_input(input: str, jokers_wild=False) -> Camels:
+    # every line is a hand then a bid, so the whitespace-separated words alternate between the two
+    words = input.split()
+    return Camels([hand_key(hand, jokers_wild) for hand in words[::2]], [int(bid) for bid in words[1::2]])
+
+def total_winnings(camels: Camels) -> int:
+    (keys, bids) = camels
+    ranked = sorted(range(len(keys)), key=keys.__getitem__)
+    return sum(rank * bids[idx] for (rank, idx) in enumerate(ranked, start=1))
 
 def process_input(input, jokers_wild=False):
-    input = input.replace("T", "V").replace("Q", "X").replace("K", "Y").replace("A", "Z")
-    input = input.replace("J", "1") if jokers_wild else input.replace("J", "W")
-    all_camels = [process_line(line) for line in input.splitlines()]
-    all_hands = [camel[0] for camel in all_camels]
-    ranked_hands = rank_hands(all_hands)
-    payouts = [camel[1] * (ranked_hands.index(camel[0]) + 1) for camel in all_camels]
-    return sum(payouts)
+    return total_winnings(parse_input(input, jokers_wild))
+
+solvers = {
+    1: Solver(parse_input, total_winnings),
+    2: Solver(partial(parse_input, jokers_wild=True), total_winnings),
+}
 
-# process_input(get_input(7, test=True))
-# process_input(get_input(7))
-# process_input(get_input(7, test=True), jokers_wild=True)
-process_input(get_input(7), jokers_wild=True)
+if __name__ == "__main__":
+    # process_input(get_input(7, test=True))
+    # process_input(get_input(7))
+    # process_input(get_input(7, test=True), jokers_wild=True)
+    process_input(get_input(7), jokers_wild=True)
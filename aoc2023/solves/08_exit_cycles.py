@@ -1,100 +1,155 @@
 # 8: exit cycles (cleaned-up solution)
 import re
-from functools import reduce
-from math import lcm
+from functools import partial
+from math import gcd
+from typing import Iterator, NamedTuple
 from modules.parse import get_input
+from modules.registry import Solver
 
-class Room:
-    def __init__(self, id: str, l_id: str, r_id: str):
-        self.id = id
-        self.l_id = l_id
-        self.r_id = r_id
-        # initialize cycle details for later
-        self.cycle: Room = self
-        self.steps = 0
-        self.exits: list[int] = []
-        # set these details later after all rooms are initialized
-        self.l: Room = None
-        self.r: Room = None
-        self.start = False
-        self.exit = False
-
-    # set links to the actual rooms, and set whether this room is a start or exit
-    def set_details(self, l_room: "Room", r_room: "Room", is_start: bool, is_exit: bool):
-        self.l = l_room
-        self.r = r_room
-        self.start = is_start
-        self.exit = is_exit
-
-    # run the initial cycle using the directions
-    def run_cycle(self, dirs: str):
-        for (num, dir) in enumerate(dirs):
-            self.cycle = self.cycle.l if dir == "L" else self.cycle.r
-            if self.cycle.exit:
-                self.exits.append(num+1)
-            self.steps = len(dirs)
-
-    # iterate the cycle using the cycle room's cycle details
-    def iter_cycle(self):
-        other = self.cycle
-        self.exits = self.exits + [self.steps + exit for exit in other.exits]
-        self.steps += other.steps
-        self.cycle = other.cycle
-
-    def __repr__(self):
-        return f"id: {self.id}, cycle: {self.cycle.id}, steps: {self.steps}, exits: {self.exits}"
-
-def parse_input(input) -> tuple[str, dict[str, Room]]:
+class Maps(NamedTuple):
+    dirs: list[int]     # 0 for left, 1 for right
+    names: list[str]    # room id to name
+    moves: tuple[list[int], list[int]]  # room ids to the left and to the right of each room
+
+class ExitSteps(NamedTuple):
+    """
+    Every step at which one ghost is on an exit: the ones before it settles into its cycle are listed, and from
+    `settled` on, the step is an exit whenever its remainder mod `period` is in `residues`.
+    """
+    before: list[int]
+    settled: int
+    period: int
+    residues: set[int]
+
+    def __contains__(self, step: int) -> bool:
+        return step in self.before if step < self.settled else step % self.period in self.residues
+
+    def below(self, limit: int) -> Iterator[int]:
+        yield from (step for step in self.before if step < limit)
+        for base in range(self.settled, limit, self.period):
+            yield from sorted(step for residue in self.residues if 0 < (step := base + (residue - base) % self.period) < limit)
+
+class Network:
+    """
+    The rooms as int ids, moved through a whole pass of the directions at a time: jumps[k][room] is the room reached
+    after 2^k passes, and pass_exits[room] the steps within one pass (starting from that room) that end on an exit.
+    Higher jump tables are only built when a jump needs them, so memory stays at one table per doubling.
+    """
+    def __init__(self, maps: Maps, exits: set[int]):
+        (self.dirs, self.moves) = (maps.dirs, maps.moves)
+        self.pass_len = len(maps.dirs)
+        self.exits = exits
+        passes = [self.run_pass(room) for room in range(len(maps.names))]
+        self.jumps = [[room for (room, _) in passes]]
+        self.pass_exits = [steps for (_, steps) in passes]
+
+    def run_pass(self, room: int) -> tuple[int, list[int]]:
+        steps = []
+        for (num, dir) in enumerate(self.dirs):
+            room = self.moves[dir][room]
+            if room in self.exits:
+                steps.append(num+1)
+        return (room, steps)
+
+    def jump(self, room: int, passes: int) -> int:
+        """ Room after the given number of whole passes, one table lookup per set bit. """
+        level = 0
+        while passes:
+            if level == len(self.jumps):
+                prev = self.jumps[-1]
+                self.jumps.append([prev[next] for next in prev])
+            if passes & 1:
+                room = self.jumps[level][room]
+            (passes, level) = (passes >> 1, level + 1)
+        return room
+
+    def room_after(self, room: int, steps: int) -> int:
+        (passes, rest) = divmod(steps, self.pass_len)
+        room = self.jump(room, passes)
+        for dir in self.dirs[:rest]:
+            room = self.moves[dir][room]
+        return room
+
+    def get_exit_steps(self, start: int) -> ExitSteps:
+        """
+        Follows the rooms at the start of each pass until one repeats (within as many passes as there are rooms),
+        which gives where the ghost settles into its cycle and how long the cycle is.
+        """
+        (seen, rooms, room) = ({}, [], start)
+        while room not in seen:
+            seen[room] = len(rooms)
+            rooms.append(room)
+            room = self.jumps[0][room]
+        (tail, length) = (seen[room], len(rooms) - seen[room])
+        (settled, period) = (tail * self.pass_len, length * self.pass_len)
+        steps = [num * self.pass_len + step for (num, room) in enumerate(rooms) for step in self.pass_exits[room]]
+        # an exit at the end of the last pass before the cycle is also the end of its last pass, so it's periodic too
+        return ExitSteps([step for step in steps if step < settled], settled, period, {step % period for step in steps if step >= settled})
+
+    def first_all_exits(self, starts: list[int]) -> int | None:
+        """
+        First step at which every ghost is on an exit at once, or None if they never are. Before the last ghost
+        settles, ghosts are checked step by step along the first ghost's exits; after that, each ghost's exits are
+        whole residue classes, which are combined by the Chinese remainder theorem (the periods needn't be coprime).
+        """
+        all_steps = [self.get_exit_steps(start) for start in starts]
+        # the ghosts have to take at least one step
+        settled = max(max(steps.settled for steps in all_steps), 1)
+        for step in all_steps[0].below(settled):
+            if all(step in steps for steps in all_steps):
+                return step
+        combined = [(0, 1)]
+        for steps in all_steps:
+            combined = list({merged for (residue, period) in combined for other in steps.residues
+                if (merged := crt(residue, period, other, steps.period)) is not None})
+        # first step from `settled` on in any combined residue class
+        return min((settled + (residue - settled) % period for (residue, period) in combined), default=None)
+
+def crt(residue1: int, period1: int, residue2: int, period2: int) -> tuple[int, int] | None:
+    """ The residue class (mod the lcm) of steps in both classes, or None if none are. """
+    div = gcd(period1, period2)
+    if (residue2 - residue1) % div:
+        return None
+    period = period1 // div * period2
+    mult = (residue2 - residue1) // div * pow(period1 // div, -1, period2 // div) % (period2 // div)
+    return ((residue1 + period1 * mult) % period, period)
+
+def parse_input(input) -> Maps:
     [dirs, _, *lines] = input.splitlines()
-    rooms = {}
-    for line in lines:
-        parsed = re.match(r"([\w]{3}) = \(([\w]{3}), ([\w]{3})\)", line).groups()
-        room = Room(*parsed)
-        rooms[room.id] = room
-    return (dirs, rooms)
-
-# iterate the cycle of each relevant room
-def iter_cycle(rooms: list[Room]):
-    for room in rooms:
-        room.iter_cycle()
-
-def find_lcm(escapes_list: list[int]) -> int:
-    return reduce(lcm, escapes_list)
-
-def escape(dirs: str, rooms: list[Room]):
-    start_rooms = [room for room in rooms if room.start]
-    # run one full cycle for every room
-    for room in rooms:
-        room.run_cycle(dirs)
-    # trim out any rooms that aren't starters and don't come from anywhere else
-    relevant_ids = [room.cycle.id for room in rooms] + [room.id for room in start_rooms]
-    rooms = [room for room in rooms if room.id in relevant_ids]
-    # only need one exit for each starting room, since the exits seem to be clean multiples
-    while any(len(room.exits) == 0 for room in start_rooms):
-        iter_cycle(rooms)
-    # lowest common multiple of each starting room's first exit
-    return find_lcm([room.exits[0] for room in start_rooms])
+    parsed = [re.match(r"([\w]{3}) = \(([\w]{3}), ([\w]{3})\)", line).groups() for line in lines]
+    names = [name for (name, _, _) in parsed]
+    ids = {name: id for (id, name) in enumerate(names)}
+    moves = ([ids[left] for (_, left, _) in parsed], [ids[right] for (_, _, right) in parsed])
+    return Maps([0 if dir == "L" else 1 for dir in dirs], names, moves)
 
 def get_aaa_start(_) -> list[str]:
     return ["AAA"]
 
-def get_multi_starts(rooms) -> list[str]:
-    return [room for room in rooms.keys() if room.endswith('A')]
+def get_multi_starts(names: list[str]) -> list[str]:
+    return [name for name in names if name.endswith('A')]
 
 def get_zzz_end(_) -> list[str]:
     return ["ZZZ"]
 
-def get_multi_ends(rooms) -> list[str]:
-    return [room for room in rooms.keys() if room.endswith('Z')]
-    
+def get_multi_ends(names: list[str]) -> list[str]:
+    return [name for name in names if name.endswith('Z')]
+
+def find_escape(maps: Maps, multi=False):
+    (starts, ends) = (get_multi_starts(maps.names), get_multi_ends(maps.names)) if multi else (get_aaa_start(maps.names), get_zzz_end(maps.names))
+    ids = {name: id for (id, name) in enumerate(maps.names)}
+    network = Network(maps, {ids[end] for end in ends})
+    return network.first_all_exits([ids[start] for start in starts])
+
 def process_input(input, multi=False):
-    (dirs, rooms) = parse_input(input)
-    (starts, ends) = (get_multi_starts(rooms), get_multi_ends(rooms)) if multi else (get_aaa_start(rooms), get_zzz_end(rooms))
-    for room in rooms.values():
-        room.set_details(rooms[room.l_id], rooms[room.r_id], room.id in starts, room.id in ends)
-    return escape(dirs, rooms.values())
-
-# process_input(get_input(8, file="test_1"))
-# process_input(get_input(8))
-# process_input(get_input(8, file="test_2"), multi=True)
-process_input(get_input(8), multi=True)
\ No newline at end of file
+    return find_escape(parse_input(input), multi)
+
+solvers = {
+    1: Solver(parse_input, find_escape),
+    2: Solver(parse_input, partial(find_escape, multi=True)),
+}
+
+if __name__ == "__main__":
+    # process_input(get_input(8, file="test_1"))
+    # process_input(get_input(8))
+    # process_input(get_input(8, file="test_2"), multi=True)
+    process_input(get_input(8), multi=True)
@@ -1,37 +1,69 @@
 # day 9: oasis predictions
-from itertools import pairwise
+from functools import cache, partial
+from math import factorial, prod
 from modules.parse import get_input
+from modules.registry import LineSolver, Solver
+
+def parse_line(line):
+    return [int(num) for num in line.split(" ")]
 
 def parse_input(input):
-    return [[int(num) for num in line.split(" ")] for line in input.splitlines()]
+    return [parse_line(line) for line in input.splitlines()]
+
+"""
+    the difference triangle of n values bottoms out after at most n rows, so the values are a polynomial of degree
+    below n in their position, and any prediction is that polynomial at another position x (Lagrange interpolation):
+        prediction = sum(values[i] * coeff[i]),  coeff[i] = prod((x - j) / (i - j) for j != i)
+    each coeff is an integer (a signed product of binomials), and only depends on n and x
+    e.g. the next value (x = n) has coeff[i] = (-1)^(n-1-i) * C(n, i)
+"""
+@cache
+def get_coeffs(length: int, x: int) -> tuple[int, ...]:
+    """ Coefficients for the value at position x of a history of the given length (0 is its first value). """
+    return tuple((-1) ** (length-1-i) * prod(x - j for j in range(length) if j != i) // (factorial(i) * factorial(length-1-i)) for i in range(length))
 
-def get_diffs(values):
-    diffs = [values]
-    while any(num != 0 for num in diffs[-1]):
-        diffs.append([v2 - v1 for (v1, v2) in pairwise(diffs[-1])])
-    return diffs    
+def predict(values: list[int], steps=1) -> int:
+    """ The value `steps` past the last one (so 0 is the last value itself), or before the first one if negative. """
+    x = len(values) - 1 + steps if steps >= 0 else steps
+    return sum(value * coeff for (value, coeff) in zip(values, get_coeffs(len(values), x)))
 
 # 9-1
 def predict_next(values):
-    diffs = get_diffs(values)
-    diff = 0
-    for line in reversed(diffs):
-        diff = diff + line[-1]
-    return diff
+    return predict(values, 1)
 
 # 9-2
 def predict_prev(values):
-    diffs = get_diffs(values)
-    diff = 0
-    for line in reversed(diffs):
-        diff = line[0] - diff
-    return diff
-
-def process_input(input, predictor=predict_next):
-    lines = parse_input(input)
-    return sum([predictor(line) for line in lines])
-
-# assert process_input(get_input(9, test=True), predict_next) == 114
-# process_input(get_input(9), predict_next)
-# assert process_input(get_input(9, test=True), predict_prev) == 2
-process_input(get_input(9), predict_prev)
+    return predict(values, -1)
+
+def predict_line(line, steps=1):
+    return predict(parse_line(line), steps)
+
+def sum_predictions(histories: list[list[int]], steps=1) -> int:
+    """
+    Predictions are linear in the values, so the sum over histories of one length is the coefficients applied to
+    the column sums of those histories: one dot product per length instead of per history.
+    """
+    column_sums: dict[int, list[int]] = {}
+    for values in histories:
+        sums = column_sums.get(len(values))
+        column_sums[len(values)] = [total + value for (total, value) in zip(sums, values)] if sums else values
+    return sum(predict(sums, steps) for sums in column_sums.values())
+
+def process_input(input, steps=1):
+    return sum_predictions(parse_input(input), steps)
+
+solvers = {
+    1: Solver(parse_input, sum_predictions),
+    2: Solver(parse_input, partial(sum_predictions, steps=-1)),
+}
+
+line_solvers = {
+    1: LineSolver(predict_line),
+    2: LineSolver(partial(predict_line, steps=-1)),
+}
+
+if __name__ == "__main__":
+    # assert process_input(get_input(9, test=True)) == 114
+    # process_input(get_input(9))
+    # assert process_input(get_input(9, test=True), steps=-1) == 2
+    process_input(get_input(9), steps=-1)
@@ -1,128 +1,121 @@
 # day 10: pipe maze
+from typing import NamedTuple
 from modules.parse import get_input
+from modules.registry import Solver
+from modules.types import Grid, dir_opposite, down_code, left_code, right_code, up_code
 
-(left, right, up, down) = ["left", "right", "up", "down"]
-# travel based on lines indexing
-travels = {left: (0, -1), right: (0, 1), up: (-1, 0), down: (1, 0)}
-opposites = {left: right, right: left, up: down, down: up}
+# the two directions out of each pipe, as dir codes
 pipes = {
-    "|": [up, down],
-    "-": [left, right],
-    "L": [up, right],
-    "J": [left, up],
-    "7": [left, down],
-    "F": [right, down],
-    ".": [],
-    "S": [up, down, left, right],
+    "|": (up_code, down_code),
+    "-": (left_code, right_code),
+    "L": (up_code, right_code),
+    "J": (left_code, up_code),
+    "7": (left_code, down_code),
+    "F": (right_code, down_code),
 }
+# row and col change for each dir code
+(row_moves, col_moves) = ((0, 0, -1, 1), (-1, 1, 0, 0))
+
+def get_turns(exits: tuple[int, int]) -> tuple[int, ...]:
+    """ Direction out of a pipe after moving into it in each direction (-1 if the pipe doesn't connect that way). """
+    turns = [-1] * 4
+    for (exit, other) in (exits, exits[::-1]):
+        turns[dir_opposite[exit]] = other
+    return tuple(turns)
+
+# indexed by cell byte, then by the dir code of the move into the cell; everything that isn't a pipe is a dead end
+pipe_turns: list[tuple[int, ...]] = [(-1, -1, -1, -1)] * 256
+for (pipe, exits) in pipes.items():
+    pipe_turns[ord(pipe)] = get_turns(exits)
+
+class Loop(NamedTuple):
+    length: int
+    area: int                   # of the polygon through the centers of the loop's cells (shoelace formula)
+    start_pipe: str             # the pipe hidden under the S
+    cells: bytearray | None     # 1 for each cell on the loop, if they were marked
+
+    def count_enclosed(self) -> int:
+        # Pick's theorem: area = enclosed + boundary / 2 - 1, where every loop cell is a boundary point
+        return self.area - self.length // 2 + 1
+
+class Maze:
+    """ The maze on a flat Grid, so each cell is an int index and each move an offset from it. """
+    def __init__(self, input: str):
+        self.grid = Grid(input)
+        self.start = self.grid.find("S")
+
+    def get_next(self, idx: int, dir: int) -> int:
+        """ Dir out of the cell next to idx, after moving into it from idx (-1 if the move isn't into a connected pipe). """
+        next = idx + self.grid.neighbor_offsets[dir]
+        return pipe_turns[self.grid.cells[next]][dir] if self.grid.in_bounds(next) else -1
+
+    def walk_loop(self, mark=False) -> Loop:
+        """
+        Follows the loop once from the start, adding up the shoelace terms (row * d_col - col * d_row) along the way.
+        """
+        (cells, offsets) = (self.grid.cells, self.grid.neighbor_offsets)
+        first = next(dir for dir in range(4) if self.get_next(self.start, dir) != -1)
+        marked = bytearray(self.grid.size) if mark else None
+        (idx, dir, length, twice_area) = (self.start, first, 0, 0)
+        (row, col) = divmod(self.start, self.grid.stride)
+        while True:
+            if mark:
+                marked[idx] = 1
+            twice_area += row * col_moves[dir] - col * row_moves[dir]
+            (row, col) = (row + row_moves[dir], col + col_moves[dir])
+            idx += offsets[dir]
+            length += 1
+            if idx == self.start:
+                break
+            dir = pipe_turns[cells[idx]][dir]
+        start_exits = {first, dir_opposite[dir]}
+        start_pipe = next(pipe for (pipe, exits) in pipes.items() if set(exits) == start_exits)
+        return Loop(length, abs(twice_area) // 2, start_pipe, marked)
+
+    def get_enclosed_cells(self, loop: Loop = None) -> bytearray:
+        """
+        1 for each cell inside the loop (for drawing; count_enclosed doesn't need it), from a parity scan along each
+        row: a cell is inside after crossing an odd number of the loop's pipes which connect upwards.
+        """
+        if loop is None or loop.cells is None:
+            loop = self.walk_loop(mark=True)
+        crossings = {ord(pipe) for (pipe, exits) in pipes.items() if up_code in exits}
+        start_crosses = up_code in pipes[loop.start_pipe]
+        (grid, enclosed) = (self.grid, bytearray(self.grid.size))
+        for row in range(grid.rows):
+            inside = False
+            for idx in range(grid.idx(row, 0), grid.idx(row, grid.cols)):
+                if loop.cells[idx]:
+                    if grid.cells[idx] in crossings or (idx == self.start and start_crosses):
+                        inside = not inside
+                elif inside:
+                    enclosed[idx] = 1
+        return enclosed
+
+    def draw(self, enclosed: bytearray = None) -> str:
+        drawn = bytearray(self.grid.cells)
+        for (idx, inside) in enumerate(enclosed or []):
+            if inside:
+                drawn[idx] = ord("I")
+        return ascii(drawn.decode())
+
+def parse_input(input) -> Maze:
+    return Maze(input)
+
+def find_farthest(maze: Maze) -> int:
+    return maze.walk_loop().length // 2
+
+def count_enclosed(maze: Maze) -> int:
+    return maze.walk_loop().count_enclosed()
 
-vert_pipes = {pipe: [dir for dir in dirs if dir in [up, down]] for (pipe, dirs) in pipes.items()}
-
-class Looper:
-    def __init__(self, maze, row, col):
-        self.maze = maze
-        self.row = row
-        self.col = col
-        self.pipe = maze[row][col]
-        self.history = [(row, col)]
-        self.last = ""
-        self.moves = 0
-
-    def move_next(self):
-        for next in pipes[self.pipe]:
-            if next == self.last:
-                continue
-            next_travel = travels[next]
-            next_row = self.row + next_travel[0]
-            next_col = self.col + next_travel[1]
-            next_pipe = self.maze[next_row][next_col]
-            next_last = opposites[next]
-            if next_last not in pipes[next_pipe]:
-                continue
-            if 0 <= next_row < len(self.maze) and 0 <= next_col < len(self.maze[0]):
-                # commit to the first valid move
-                self.row = next_row
-                self.col = next_col
-                self.pipe = next_pipe
-                self.last = next_last
-                self.moves += 1
-                if not self.is_looped():
-                    self.history.append((next_row, next_col))
-                return
-
-    def is_looped(self):
-        return self.pipe == "S" and self.moves > 0
-
-    def get_start_pipe(self):
-        to_first = get_direction(self.history[0], self.history[1])
-        to_last = get_direction(self.history[0], self.history[-1])
-        start_moves = sorted([to_first, to_last])
-        for (pipe, pipe_moves) in pipes.items():
-            if start_moves == sorted(pipe_moves):
-                return pipe
-        
-    def draw_outline(self):
-        outline_draw = [list("." * len(self.maze[0])) for row in range(len(self.maze))]
-        for (row, col) in self.history:
-            outline_draw[row][col] = self.maze[row][col]
-        (start_row, start_col) = self.history[0]
-        outline_draw[start_row][start_col] = self.get_start_pipe()
-        outline_draw = [''.join(row) for row in outline_draw]
-        return outline_draw
-        
-    def get_outline(self):
-        all_rows = {row: {} for row in range(len(self.maze))}
-        for (row, col) in self.history:
-            all_rows[row][col] = self.maze[row][col]
-        (start_row, start_col) = self.history[0]
-        all_rows[start_row][start_col] = self.get_start_pipe()
-        outline = {row: sorted(item for item in pipes.items() if item[1] != "-") for (row, pipes) in all_rows.items() if len(pipes) > 0}
-        return outline
-
-    def count_enclosed_tiles(self):
-        outline = self.get_outline()
-        total = 0
-        for (row, row_outline) in outline.items():
-            # reset vertical test for each row
-            vert_test = {up: False, down: False}
-            prev_col = -1
-
-            for (col, pipe) in row_outline:
-                if vert_test == {up: True, down: True}:
-                    # inside the loop; count tiles since previous pipe
-                    total += col - prev_col - 1
-                # update vertical test
-                for dir in vert_pipes[pipe]:
-                    vert_test[dir] = not vert_test[dir]
-                prev_col = col
-        return total
-
-    def __repr__(self):
-        return f"{self.pipe} at [{self.row},{self.col}], {self.moves} moves, from={self.last}"
-
-def parse_input(input):
-    lines = input.splitlines()
-    # add 1 for the newline character
-    row_len = len(lines[0]) + 1
-    start_idx = input.find("S")
-    start_col = start_idx % row_len
-    start_row = int((start_idx - start_col) / row_len)
-    return (lines, start_row, start_col)
-
-def get_direction(a, b):
-    (a_row, a_col) = a
-    (b_row, b_col) = b
-    (row_move, col_move) = (b_row - a_row, b_col - a_col)
-    for (dir, (t_row_move, t_col_move)) in travels.items():
-        if row_move == t_row_move and col_move == t_col_move:
-            return dir
-    
 def process_input(input):
-    (maze, start_row, start_col) = parse_input(input)
-    looper = Looper(maze, start_row, start_col)
-    while not looper.is_looped():
-        looper.move_next()
-    return (int(looper.moves / 2), looper.count_enclosed_tiles())
+    loop = parse_input(input).walk_loop()
+    return (loop.length // 2, loop.count_enclosed())
+
+solvers = {
+    1: Solver(parse_input, find_farthest),
+    2: Solver(parse_input, count_enclosed),
+}
 
 def ascii(line):
     res = line.replace("L", "┕").replace("J", "┙").replace("7", "┑").replace("F", "┍").replace("|", "┆").replace("-", "─")
@@ -131,6 +124,7 @@ def ascii(line):
 def print_maze(lines):
     print("\n".join([ascii(line) for line in lines]))
 
-# process_input(get_input(10, file="test_1"))
-# process_input(get_input(10, file="test_2"))
-process_input(get_input(10))
\ No newline at end of file
+if __name__ == "__main__":
+    # process_input(get_input(10, file="test_1"))
+    # process_input(get_input(10, file="test_2"))
+    process_input(get_input(10))
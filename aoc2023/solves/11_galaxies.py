@@ -1,8 +1,23 @@
 # day 11: galaxies
 import re
-from functools import reduce
-from itertools import combinations
+from functools import partial
+from typing import NamedTuple
 from modules.parse import get_input
+from modules.registry import Solver
+
+class Distances(NamedTuple):
+    """
+    Sum of the distances between every pair of galaxies, as a function of the expansion ratio: each empty line
+    between two galaxies adds (ratio - 1) to their distance, so the sum is base + (ratio - 1) * gaps.
+    """
+    base: int   # sum of distances before expanding
+    gaps: int   # sum over pairs of the empty rows and columns between them
+
+    def at(self, ratio: int) -> int:
+        return self.base + (ratio - 1) * self.gaps
+
+    def __add__(self, other: "Distances") -> "Distances":
+        return Distances(self.base + other.base, self.gaps + other.gaps)
 
 def to_row_col(loc, cols):
     # add 1 for the newline character
@@ -11,25 +26,6 @@ def to_row_col(loc, cols):
     loc_row = int((loc - loc_col) / row_len)
     return (loc_row, loc_col)
 
-def missing(idxs, len_idx):
-    full_set = set(range(len_idx))
-    idx_set = set(idxs)
-    return sorted(list(full_set - idx_set))
-
-# preserves initial ordering of idxs
-def expand_dim(idxs, len_idx, ratio):
-    total = 0
-    missing_idxs = missing(idxs, len_idx)
-    new_idxs = {old_idx: old_idx + ratio * len([idx for idx in missing_idxs if idx < old_idx]) for old_idx in idxs}
-    return ([new_idxs[old_idx] for old_idx in idxs], len_idx + ratio * len(missing_idxs))
-    
-def expand_universe(galaxies, rows, cols, ratio):
-    (new_row_nums, new_rows) = expand_dim([row_num for (row_num, _) in galaxies], rows, ratio)
-    (new_col_nums, new_cols) = expand_dim([col_num for (_, col_num) in galaxies], cols, ratio)
-    # can use zip, since initial orderings are preserved
-    new_galaxies = list(zip(new_row_nums, new_col_nums))
-    return (new_galaxies, new_rows, new_cols)
-    
 def parse_input(input):
     lines = input.splitlines()
     num_rows = len(lines)
@@ -39,22 +35,49 @@ def parse_input(input):
     galaxies = [to_row_col(loc, num_cols) for loc in raw_locs]
     return (galaxies, num_rows, num_cols)
 
-def dist(a, b):
-    return abs(b[1]-a[1]) + abs(b[0]-a[0])
+def axis_distances(idxs: list[int], len_idx: int) -> Distances:
+    """
+    Distances along one axis, walking its lines in order with running totals, so each pair's difference is added
+    without visiting the pair: a galaxy at idx is idx * (galaxies before it) - (sum of their idxs) from them all.
+    The lines are counted rather than sorted, which keeps it linear in galaxies plus lines.
+    """
+    counts = [0] * len_idx
+    for idx in idxs:
+        counts[idx] += 1
+    (seen, idx_total, empty, empty_total) = (0, 0, 0, 0)
+    (base, gaps) = (0, 0)
+    for (idx, count) in enumerate(counts):
+        if not count:
+            empty += 1
+            continue
+        base += count * (seen * idx - idx_total)
+        gaps += count * (seen * empty - empty_total)
+        seen += count
+        idx_total += count * idx
+        empty_total += count * empty
+    return Distances(base, gaps)
 
-def sum(list):
-    return reduce(lambda x,y: x+y, list)
+def get_distances(parsed) -> Distances:
+    (galaxies, num_rows, num_cols) = parsed
+    return axis_distances([row for (row, _) in galaxies], num_rows) + axis_distances([col for (_, col) in galaxies], num_cols)
 
-def calc_distance(galaxies):
-    dists = [dist(a,b) for (a,b) in combinations(galaxies, 2)]
-    return sum(dists)
+def sum_expanded_distances(parsed, ratio=2):
+    return get_distances(parsed).at(ratio)
+
+def sum_expanded_distances_many(parsed, ratios: list[int]) -> list[int]:
+    distances = get_distances(parsed)
+    return [distances.at(ratio) for ratio in ratios]
 
 def process_input(input, ratio=2):
-    (galaxies, num_rows, num_cols) = parse_input(input)
-    (galaxies, num_rows, num_cols) = expand_universe(galaxies, num_rows, num_cols, ratio-1)
-    return calc_distance(galaxies)
-
-# process_input(get_input(11, test=True))
-# process_input(get_input(11))
-# process_input(get_input(11, test=True), ratio=100)
-process_input(get_input(11), ratio=1_000_000)
\ No newline at end of file
+    return sum_expanded_distances(parse_input(input), ratio)
+
+solvers = {
+    1: Solver(parse_input, sum_expanded_distances),
+    2: Solver(parse_input, partial(sum_expanded_distances, ratio=1_000_000)),
+}
+
+if __name__ == "__main__":
+    # process_input(get_input(11, test=True))
+    # process_input(get_input(11))
+    # process_input(get_input(11, test=True), ratio=100)
+    process_input(get_input(11), ratio=1_000_000)
@@ -1,85 +1,87 @@
 # day 12: springcross (DP approach, works with unfold)
-from modules.parse import get_input
+from functools import partial
+from modules.parse import get_input, map_reduce_lines
+from modules.registry import LineSolver, Solver
 
 class PuzzleLine:
     def __init__(self, puzzle: str, clues: list[int]):
         self.puzzle = puzzle
         self.clues = clues
-        self.hashes = self.get_hashes()
-        self.hash_total = self.get_hash_total()
-        self.counts: dict[int, list[tuple[int, int]]] = {}
-
-    def get_hashes(self) -> list[int]:
-        return [1 if piece == "#" else 0 for piece in self.puzzle]
-
-    def get_hash_total(self) -> list[int]:
-        total = 0
-        return [total := (total + 1 if piece == "#" else total) for piece in self.puzzle]
 
     def get_count(self) -> int:
-        self.count_clue(len(self.clues) - 1)
-        total_hashes = self.hash_total[-1]
-        total = sum([total for (total, hashes) in self.count_clue(len(self.clues) - 1) if hashes == total_hashes])
-        return total
-
-    def count_clue(self, clue_num=0) -> list[tuple[int, int]]:
-        if (counted := self.counts.get(clue_num)):
-            return counted
-
-        if clue_num == 0:
-            return self.count_first_clue()
-        
-        prev = self.count_clue(clue_num - 1)
-        valid = [(0, 0) for idx in range(0, len(self.puzzle))]
-        clue_size = self.clues[clue_num]
-        for idx in range(2, len(self.puzzle) - clue_size + 1):
-            (head, tail) = (idx, idx + clue_size - 1)
-            part = self.puzzle[head:tail+1]
-            if "." not in part:
-                hashes = sum(self.hashes[head:tail+1])
-                total = 0
-                for prev_valid in prev[0:head - 1]:
-                    if prev_valid[1] + hashes == self.hash_total[tail]:
-                        total += prev_valid[0]
-                if total > 0:
-                    valid[tail] = (total, self.hash_total[tail])
-
-        self.counts[clue_num] = valid
-        return valid
+        # dots at either end can't hold a spring, so the DP can skip them
+        return count_arrangements(self.puzzle.strip("."), tuple(self.clues))
 
-    def count_first_clue(self, clue_num=0) -> list[tuple[int, int]]:
-        valid = [(0, 0) for idx in range(0, len(self.puzzle))]
-        clue_size = self.clues[clue_num]
-        for idx in range(0, len(self.puzzle) - clue_size + 1):
-            (head, tail) = (idx, idx + clue_size - 1)
-            part = self.puzzle[head:tail+1]
-            if "." not in part:
-                hashes = sum(self.hashes[head:tail+1])
-                if hashes == self.hash_total[tail]:
-                    valid[tail] = (1, hashes)
-        self.counts[clue_num] = valid
-        return valid
+"""
+    ways[i] = ways to place the clues so far within the first i pieces, with none of those pieces left as an unplaced #
+    for each clue, either piece i-1 is empty (ways[i-1] again, a running total along the row), or the clue's springs
+    end at piece i-1: none of its pieces are "." (checked with prefix counts of dots), the piece before it isn't "#",
+    and the earlier clues fit before that piece
+    so each clue is one pass over the pieces: O(pieces * clues) per line
+"""
+def count_arrangements(pattern: str, clues: tuple[int, ...]) -> int:
+    dots = [0]
+    for piece in pattern:
+        dots.append(dots[-1] + (piece == "."))
+    # with no clues placed, only pieces before the first # can be left empty
+    first_hash = pattern.find("#") % (len(pattern) + 1)
+    ways = [1] * (first_hash + 1) + [0] * (len(pattern) - first_hash)
+    for clue in clues:
+        next_ways = [0] * (len(pattern) + 1)
+        for end in range(clue, len(pattern) + 1):
+            total = next_ways[end-1] if pattern[end-1] != "#" else 0
+            start = end - clue
+            if dots[end] == dots[start]:
+                if start == 0:
+                    total += ways[0]
+                elif pattern[start-1] != "#":
+                    total += ways[start-1]
+            next_ways[end] = total
+        ways = next_ways
+    return ways[-1]
 
 # parsers
-def unfold_line(puzzle: str, clues: list[int]) -> tuple[str, list[int]]:
-    return ("?".join([puzzle] * 5), clues * 5)
+def unfold_line(puzzle: str, clues: list[int], folds=5) -> tuple[str, list[int]]:
+    return ("?".join([puzzle] * folds), clues * folds)
     
-def parse_line(line: str, unfold=False) -> PuzzleLine:
+def parse_line(line: str, folds=1) -> PuzzleLine:
     (puzzle, clues) = line.split(" ")
     clues = [int(clue) for clue in clues.split(",")]
-    if unfold:
-        (puzzle, clues) = unfold_line(puzzle, clues)
+    if folds > 1:
+        (puzzle, clues) = unfold_line(puzzle, clues, folds)
     return PuzzleLine(puzzle, clues)
     
-def parse_input(input: str, unfold=False) -> list[PuzzleLine]:
+def parse_input(input: str, folds=1) -> list[PuzzleLine]:
     lines = input.splitlines()
-    return [parse_line(line, unfold) for line in lines]  
+    return [parse_line(line, folds) for line in lines]  
 
-def process_input(input: str, unfold=False):
-    lines = parse_input(input, unfold)
+def count_line(line: str, folds=1) -> int:
+    return parse_line(line, folds).get_count()
+
+def sum_counts(lines: list[PuzzleLine]) -> int:
     return sum([line.get_count() for line in lines])
 
-# process_input(get_input(12, test=True))
-# process_input(get_input(12))
-# process_input(get_input(12, test=True), unfold=True)
-process_input(get_input(12), unfold=True)
+def sum_counts_parallel(lines: list[str], folds=1, workers=0, chunk_size=32) -> int:
+    """ Counts chunks of raw lines in a pool of processes (0 workers for one per CPU), via map_reduce_lines. """
+    return map_reduce_lines(lines, 12, "count_line", {"folds": folds}, "sum", workers, chunk_size)
+
+def process_input(input: str, folds=1, workers=1, chunk_size=32):
+    if workers == 1:
+        return sum_counts(parse_input(input, folds))
+    return sum_counts_parallel(input.splitlines(), folds, workers, chunk_size)
+
+solvers = {
+    1: Solver(parse_input, sum_counts),
+    2: Solver(partial(parse_input, folds=5), sum_counts),
+}
+
+line_solvers = {
+    1: LineSolver(count_line),
+    2: LineSolver(partial(count_line, folds=5)),
+}
+
+if __name__ == "__main__":
+    # process_input(get_input(12, test=True))
+    # process_input(get_input(12))
+    # process_input(get_input(12, test=True), folds=5)
+    process_input(get_input(12), folds=5)
@@ -1,66 +1,71 @@
 # day 13: smudgy mirrors
+from functools import partial
+from typing import NamedTuple
 from modules.parse import get_input
+from modules.registry import Solver
+from modules.types import Grid
 
-def count_diffs(row_a: list, row_b: list) -> int:
-    return sum(1 for (a,b) in zip(row_a, row_b) if a != b)
+class Field(NamedTuple):
+    """ Each row and each column as an int bitmask of its rocks, so comparing two lines is one int comparison. """
+    rows: list[int]
+    cols: list[int]
 
-def check_reflection(pair: tuple[int, int], row_to_rows: dict[int, list[int]], lines: list[str], require_smudge: bool) -> tuple[int, int]:
-    (l, r) = pair
-    smudges = 0
-    while l >= 0 and r < len(row_to_rows):
-        if r not in row_to_rows[l]:
-            if not require_smudge:
-                return None
-            smudges += count_diffs(lines[l], lines[r])
-            if smudges > 1:
-                return None
-        l -= 1
-        r += 1
-    if not require_smudge:
-        return pair
-    return pair if smudges == 1 else None
+rock_bits = bytes.maketrans(b"#.", b"10")
+
+def parse_field(grid: Grid) -> Field:
+    # translating the whole flat grid once lets each row and column be read off as a slice (columns step by the
+    # stride), much faster than setting a bit per rock
+    bits = grid.cells.translate(rock_bits)
+    rows = [int(bits[start : start + grid.cols], 2) for start in range(0, grid.size, grid.stride)]
+    cols = [int(bits[col :: grid.stride], 2) for col in range(grid.cols)]
+    return Field(rows, cols)
 
-def find_reflection(lines: list[str], require_smudge: bool):
-    adjacent: list[tuple[int, int]] = []
-    terrain_to_rows: dict[str, list[int]] = {}
-    row_to_rows: dict[int, list[int]] = {}
-    for (idx, line) in enumerate(lines):
-        prev = terrain_to_rows.get(line, [])
-        row_to_rows[idx] = prev
-        prev.append(idx)
-        if (idx - 1) in prev:
-            adjacent.append((idx-1, idx))
-        if require_smudge and idx > 0 and count_diffs(line, lines[idx-1]) == 1:
-            adjacent.append((idx-1, idx))
-        terrain_to_rows[line] = prev
+def count_smudges(lines: list[int], split: int, most: int) -> int:
+    """ Differences between the lines mirrored across the split (between split-1 and split), stopping past `most`. """
+    smudges = 0
+    for offset in range(min(split, len(lines) - split)):
+        if (a := lines[split - 1 - offset]) != (b := lines[split + offset]):
+            smudges += (a ^ b).bit_count()
+            if smudges > most:
+                break
+    return smudges
 
-    for pair in adjacent:
-        res = check_reflection(pair, row_to_rows, lines, require_smudge)
-        if res is not None:
-            return res
+def find_reflection(lines: list[int], smudges=0) -> tuple[int, int] | None:
+    """ The first pair of neighboring lines that the field reflects across with exactly `smudges` differences. """
+    for split in range(1, len(lines)):
+        if count_smudges(lines, split, smudges) == smudges:
+            return (split - 1, split)
     return None
 
-def flip(lines: list[str]) -> list[str]:
-    return ["".join(line[col] for line in lines) for col in range(len(lines[0]))]
-    
-def find_mirror(field: list[str], require_smudge: bool):
-    res = ("row", find_reflection(field, require_smudge))
+def find_mirror(field: Field, smudges=0):
+    res = ("row", find_reflection(field.rows, smudges))
     if res[1] is None:
-        res = ("column", find_reflection(flip(field), require_smudge))
+        res = ("column", find_reflection(field.cols, smudges))
     (dir, loc) = res
+    if loc is None:
+        # with more smudges than the puzzle has, a field may not reflect at all
+        return (0, None, None)
     return (loc[1] * 100 if dir == "row" else loc[1], dir, loc)
 
-def parse_input(input: str) -> list[list[str]]:
+def parse_input(input: str) -> list[Field]:
     parts = input.split("\n\n")
-    return [part.splitlines() for part in parts]
+    return [parse_field(Grid(part)) for part in parts]
 
-def process_input(input: str, require_smudge=False):
-    fields = parse_input(input)
-    res = [find_mirror(field, require_smudge) for field in fields]
+def summarize_mirrors(fields: list[Field], smudges=0):
+    res = [find_mirror(field, smudges) for field in fields]
     # return res
     return sum([field_res[0] for field_res in res])
 
-# process_input(get_input(13, test=True))
-# process_input(get_input(13))
-# process_input(get_input(13, test=True), require_smudge=True)
-process_input(get_input(13), require_smudge=True)
\ No newline at end of file
+def process_input(input: str, smudges=0):
+    return summarize_mirrors(parse_input(input), smudges)
+
+solvers = {
+    1: Solver(parse_input, summarize_mirrors),
+    2: Solver(parse_input, partial(summarize_mirrors, smudges=1)),
+}
+
+if __name__ == "__main__":
+    # process_input(get_input(13, test=True))
+    # process_input(get_input(13))
+    # process_input(get_input(13, test=True), smudges=1)
+    process_input(get_input(13), smudges=1)
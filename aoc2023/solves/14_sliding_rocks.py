@@ -1,6 +1,9 @@
 # day 14: sliding rocks
+from functools import partial
 from math import floor
 from modules.parse import get_input
+from modules.registry import Solver
+from modules.types import Grid
 from modules.utils import rev
 
 up = ("rows", -1)
@@ -12,22 +15,21 @@ other_axis = {"rows": "cols", "cols": "rows"}
 spin_cycle = [up, left, down, right]
 
 class RockTilter:
-    def __init__(self, lines: list[str]):
-        if len(lines) != len(lines[0]):
+    def __init__(self, grid: Grid):
+        if grid.rows != grid.cols:
             raise("noph!")
-        self.size = len(lines)
-        self.lines = lines
+        self.size = grid.rows
+        self.grid = grid
         self.rocks = self.init_map("O")
         self.blocks = self.init_map("#")
 
     def init_map(self, block_type: str) -> dict[str, dict[int, list[int]]]:
-        row_map = {row_idx: [] for row_idx in range(self.size)}
+        block = ord(block_type)
+        row_map = {row_idx: [col for (col, spot) in enumerate(self.grid.row(row_idx)) if spot == block] for row_idx in range(self.size)}
         col_map = {col_idx: [] for col_idx in range(self.size)}
-        for (row, line) in enumerate(self.lines):
-            for (col, spot) in enumerate(line):
-                if spot == block_type:
-                    row_map[row].append(col)
-                    col_map[col].append(row)
+        for (row, cols) in row_map.items():
+            for col in cols:
+                col_map[col].append(row)
         return {"rows": row_map, "cols": col_map}
 
     def get_load(self) -> int:
@@ -92,17 +94,25 @@ def advance(prev: int, now: int, max: int) -> int:
     return now + skip
 
 def parse_input(input: str) -> RockTilter:
-    return RockTilter(input.splitlines())
+    return RockTilter(Grid(input))
 
-def process_input(input: str, cycles_to_run: int = None):
-    tilter = parse_input(input)
+def get_tilted_load(tilter: RockTilter, cycles_to_run: int = None):
     if cycles_to_run:
         tilter.run_spin_cycles(1_000_000_000)
     else:
         tilter.tilt_rocks(up)
     return tilter.get_load()
 
-# process_input(get_input(14, test=True))
-# process_input(get_input(14))
-# process_input(get_input(14, test=True), cycles_to_run=1_000_000_000)
-process_input(get_input(14), cycles_to_run=1_000_000_000)
+def process_input(input: str, cycles_to_run: int = None):
+    return get_tilted_load(parse_input(input), cycles_to_run)
+
+solvers = {
+    1: Solver(parse_input, get_tilted_load),
+    2: Solver(parse_input, partial(get_tilted_load, cycles_to_run=1_000_000_000)),
+}
+
+if __name__ == "__main__":
+    # process_input(get_input(14, test=True))
+    # process_input(get_input(14))
+    # process_input(get_input(14, test=True), cycles_to_run=1_000_000_000)
+    process_input(get_input(14), cycles_to_run=1_000_000_000)
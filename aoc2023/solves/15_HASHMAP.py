@@ -1,6 +1,8 @@
 # day 15: HASHMAP
 import re
+from functools import partial
 from modules.parse import get_input
+from modules.registry import Solver
 
 # sod naming convention, going with "rule of cool" for this one
 class HASHMAP:
@@ -53,8 +55,7 @@ def HASH(step) -> int:
 def parse_input(input: str) -> list[str]:
     return input.split(",")
 
-def process_input(input: str, do_lenses=False):
-    seq = parse_input(input)
+def run_steps(seq: list[str], do_lenses=False):
     if do_lenses:
         hashmap = HASHMAP(seq)
         hashmap.run_sequence()
@@ -63,7 +64,16 @@ def process_input(input: str, do_lenses=False):
         res = [HASH(step) for step in seq]
         return sum(res)
 
-# process_input(get_input(15, test=True))
-# process_input(get_input(15))
-# process_input(get_input(15, test=True), do_lenses=True)
-process_input(get_input(15), do_lenses=True)
+def process_input(input: str, do_lenses=False):
+    return run_steps(parse_input(input), do_lenses)
+
+solvers = {
+    1: Solver(parse_input, run_steps),
+    2: Solver(parse_input, partial(run_steps, do_lenses=True)),
+}
+
+if __name__ == "__main__":
+    # process_input(get_input(15, test=True))
+    # process_input(get_input(15))
+    # process_input(get_input(15, test=True), do_lenses=True)
+    process_input(get_input(15), do_lenses=True)
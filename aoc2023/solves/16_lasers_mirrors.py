@@ -1,8 +1,11 @@
 # day 16: lasers and mirrors
+from functools import partial
 from typing import NamedTuple
 
+from modules.instrument import timed
 from modules.parse import get_input
-from modules.types import Dir, Loc
+from modules.registry import Solver
+from modules.types import Dir, Grid as CellGrid, dir_offsets, dirs_by_code
 
 # map of current to new direction(s) of travel for each mirror type
 mirrors: dict[str, dict[Dir, list[Dir]]] = {
@@ -13,47 +16,49 @@ mirrors: dict[str, dict[Dir, list[Dir]]] = {
     ".": {Dir.left: [Dir.left], Dir.right: [Dir.right], Dir.up: [Dir.up], Dir.down: [Dir.down]},
 }
 
+# the same map by cell byte and dir code, so the hot loop only indexes tuples
+mirror_codes: list[tuple[tuple[int, ...], ...] | None] = [None] * 256
+for (mirror, turns) in mirrors.items():
+    mirror_codes[ord(mirror)] = tuple(tuple(new_dir.code for new_dir in turns[dir]) for dir in dirs_by_code)
+
 class Laser(NamedTuple):
-    row: int
-    col: int
+    idx: int        # index into the cell grid (just outside the grid for initial lasers)
     dir: Dir
 
 class Grid:
-    def __init__(self, lines: list[str]):
-        self.lines = lines
-        self.rows = len(lines)
-        self.cols = len(lines[0])
-        self.lasers: list[Laser] = []
-        self.marked: dict[Loc, list[Dir]] = {}
+    def __init__(self, cells: CellGrid):
+        self.cells = cells
+        self.rows = cells.rows
+        self.cols = cells.cols
+        # in-flight lasers are packed into single ints (idx << 2 | dir code)
+        self.lasers: list[int] = []
+        # bitmask of the dir codes which have already left each cell
+        self.marked = bytearray(cells.size)
         self.results: dict[Laser, int] = {}
 
     def get_max_energized(self) -> int:
         return max(self.results.values())
 
     def get_energized(self) -> int:
-        return len(self.marked)
-
-    def is_valid_position(self, row: int, col: int) -> bool:
-        return (0 <= row < self.rows) and (0 <= col < self.cols)
+        return len(self.marked) - self.marked.count(0)
 
-    def mark_valid_lasers(self, row: int, col: int, dirs: list[Dir]) -> list[Laser]:
-        loc = Loc(row, col)
-        valid: list[Laser] = []
-        marked_dirs = self.marked.get(loc, [])
-        for dir in dirs:
+    def mark_valid_lasers(self, idx: int, codes: tuple[int, ...]) -> list[int]:
+        valid: list[int] = []
+        marked = self.marked
+        for code in codes:
             # don't process any lasers which have already gone this direction from this location
-            if dir not in marked_dirs:
-                marked_dirs.append(dir)
-                valid.append(Laser(row, col, dir))
-        self.marked[loc] = marked_dirs
+            if not marked[idx] & (1 << code):
+                marked[idx] |= 1 << code
+                valid.append(idx << 2 | code)
         return valid
 
     def get_initial_lasers(self) -> list[Laser]:
+        idx = self.cells.idx
         all_lasers = (
-            [Laser(row, -1, Dir.right) for row in range(self.rows)]
-            + [Laser(row, self.cols, Dir.left) for row in range(self.rows)]
-            + [Laser(-1, col, Dir.down) for col in range(self.cols)]
-            + [Laser(self.rows, col, Dir.up) for col in range(self.cols)])
+            [Laser(idx(row, -1), Dir.right) for row in range(self.rows)]
+            + [Laser(idx(row, self.cols), Dir.left) for row in range(self.rows)]
+            + [Laser(idx(-1, col), Dir.down) for col in range(self.cols)]
+            + [Laser(idx(self.rows, col), Dir.up) for col in range(self.cols)])
         return all_lasers
         
     # PEW PEW PEW! FIRE EVERYTHING!!!!!!111
@@ -61,37 +66,48 @@ class Grid:
         for laser in self.get_initial_lasers():
             self.fire_lasers(laser)
 
-    def fire_lasers(self, initial_laser=Laser(0, -1, Dir.right)):
-        self.lasers = [initial_laser]
-        self.marked = {}
+    def fire_lasers(self, initial_laser: Laser = None):
+        initial_laser = initial_laser or Laser(self.cells.idx(0, -1), Dir.right)
+        self.lasers = [initial_laser.idx << 2 | initial_laser.dir.code]
+        self.marked = bytearray(self.cells.size)
         while len(self.lasers) > 0:
             self.move_lasers()
         self.results[initial_laser] = self.get_energized()
     
+    @timed("day16.move_lasers")
     def move_lasers(self):
         next_lasers = []
-        for (row, col, dir) in self.lasers:
-            (new_row, new_col) = (row + dir.value[0], col + dir.value[1])
-            if not self.is_valid_position(new_row, new_col):
+        (cells, size, offsets) = (self.cells.cells, self.cells.size, dir_offsets(self.cells.stride))
+        for laser in self.lasers:
+            code = laser & 3
+            new_idx = (laser >> 2) + offsets[code]
+            # the grid's newlines mark the left and right edges
+            if not 0 <= new_idx < size or (cell := cells[new_idx]) == CellGrid.newline:
                 continue
-            mirror = self.lines[new_row][new_col]
-            new_dirs = mirrors[mirror][dir]
-            next_lasers += self.mark_valid_lasers(new_row, new_col, new_dirs)
+            next_lasers += self.mark_valid_lasers(new_idx, mirror_codes[cell][code])
         self.lasers = next_lasers
 
-def parse_input(input: str) -> list[str]:
-    return input.splitlines()
+def parse_input(input: str) -> CellGrid:
+    return CellGrid(input)
 
-def process_input(input: str, fire_ALL_lasers=False):
-    lines = parse_input(input)
-    grid = Grid(lines)
+def get_energized(cells: CellGrid, fire_ALL_lasers=False):
+    grid = Grid(cells)
     if fire_ALL_lasers:
         grid.fire_ALL_lasers()
     else:
         grid.fire_lasers()
     return grid.get_max_energized()
 
-# process_input(get_input(16, test=True))
-# process_input(get_input(16))
-# process_input(get_input(16, test=True), fire_ALL_lasers=True)
-process_input(get_input(16), fire_ALL_lasers=True)
+def process_input(input: str, fire_ALL_lasers=False):
+    return get_energized(parse_input(input), fire_ALL_lasers)
+
+solvers = {
+    1: Solver(parse_input, get_energized),
+    2: Solver(parse_input, partial(get_energized, fire_ALL_lasers=True)),
+}
+
+if __name__ == "__main__":
+    # process_input(get_input(16, test=True))
+    # process_input(get_input(16))
+    # process_input(get_input(16, test=True), fire_ALL_lasers=True)
+    process_input(get_input(16), fire_ALL_lasers=True)
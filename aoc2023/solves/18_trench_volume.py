@@ -2,7 +2,9 @@
 import re
 from typing import NamedTuple
 from bisect import bisect_left, bisect_right
+from functools import partial
 from modules.parse import get_input
+from modules.registry import Solver
 from modules.types import Dir, Loc
 
 class Plan(NamedTuple):
@@ -117,13 +119,21 @@ def parse_line(line: str, decode_color: bool) -> Plan:
 def parse_input(input, decode_color: bool) -> list[Plan]:
     return [parse_line(line, decode_color) for line in input.splitlines()]
 
-def process_input(input: str, decode_color=False):
-    plans = parse_input(input, decode_color)
+def get_lagoon_area(plans: list[Plan]) -> int:
     digger = Digger(plans)
     return digger.dig_lagoon().get_total_area()
 
+def process_input(input: str, decode_color=False):
+    return get_lagoon_area(parse_input(input, decode_color))
+
+solvers = {
+    1: Solver(partial(parse_input, decode_color=False), get_lagoon_area),
+    2: Solver(partial(parse_input, decode_color=True), get_lagoon_area),
+}
+
 
-# process_input(get_input(18, test=True))
-# process_input(get_input(18))
-# process_input(get_input(18, test=True), decode_color=True)
-process_input(get_input(18), decode_color=True)
+if __name__ == "__main__":
+    # process_input(get_input(18, test=True))
+    # process_input(get_input(18))
+    # process_input(get_input(18, test=True), decode_color=True)
+    process_input(get_input(18), decode_color=True)
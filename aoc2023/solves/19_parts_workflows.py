@@ -1,8 +1,10 @@
 # day 19: parts workflows
 import re
 from enum import Enum
+from functools import partial
 from typing import Literal, NamedTuple
 from modules.parse import get_input
+from modules.registry import Solver
 
 class Result(Enum):
     Accept = 1
@@ -173,12 +175,21 @@ def parse_input(input, is_super):
     parts = [parse_part(part) for part in parts]
     return (flows, parts)
 
-def process_input(input, is_super=False):
-    (flows, parts) = parse_input(input, is_super)
+def get_score(parsed, is_super=False):
+    (flows, parts) = parsed
     runner = SuperFlowRunner(flows) if is_super else FlowRunner(flows, parts)
     return runner.get_score()
 
-# process_input(get_input(19, test=True))
-# process_input(get_input(19))
-# process_input(get_input(19, test=True), is_super=True)
-process_input(get_input(19), is_super=True)
+def process_input(input, is_super=False):
+    return get_score(parse_input(input, is_super), is_super)
+
+solvers = {
+    1: Solver(partial(parse_input, is_super=False), get_score),
+    2: Solver(partial(parse_input, is_super=True), partial(get_score, is_super=True)),
+}
+
+if __name__ == "__main__":
+    # process_input(get_input(19, test=True))
+    # process_input(get_input(19))
+    # process_input(get_input(19, test=True), is_super=True)
+    process_input(get_input(19), is_super=True)
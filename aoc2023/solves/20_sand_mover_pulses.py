@@ -2,9 +2,11 @@
 import re
 from collections import defaultdict, deque
 from enum import Enum
-from functools import reduce
+from functools import partial, reduce
 from typing import NamedTuple
+from modules.instrument import timed
 from modules.parse import get_input
+from modules.registry import Solver
 
 
 class Role(Enum):
@@ -200,6 +202,7 @@ class PulseRunner:
             self.run_cycle()
         return self
     
+    @timed("day20.run_cycle")
     def run_cycle(self):
         self.cycles += 1
         self.modules["button"].press()
@@ -241,16 +244,24 @@ def format_pulse(line):
 def format_queue(line):
     return f"""{f"{line[1]}{f' ({line[4]})' if line[4] else ''}":14} -> {line[2]:6} -> {line[3]}"""
      
-def process_input(input, calculate_sand=False, cycles_to_run=1000, cycles_to_debug=[]):
-    nodes = parse_input(input)
+def run_pulses(nodes: list[Node], calculate_sand=False, cycles_to_run=1000, cycles_to_debug=[]):
     runner = PulseRunner(nodes, cycles_to_debug=cycles_to_debug).run_cycles(cycles_to_run)
     if calculate_sand:
         return runner.calculate_sand_cycle()
     else:
         return runner.get_pulse_product()
 
+def process_input(input, calculate_sand=False, cycles_to_run=1000, cycles_to_debug=[]):
+    return run_pulses(parse_input(input), calculate_sand, cycles_to_run, cycles_to_debug)
+
+solvers = {
+    1: Solver(parse_input, run_pulses),
+    2: Solver(parse_input, partial(run_pulses, calculate_sand=True, cycles_to_run=10000)),
+}
+
 
-# process_input(get_input(20, file="test_1"))
-# process_input(get_input(20, file="test_2"))
-# process_input(get_input(20))
-process_input(get_input(20), calculate_sand=True, cycles_to_run=10000)
+if __name__ == "__main__":
+    # process_input(get_input(20, file="test_1"))
+    # process_input(get_input(20, file="test_2"))
+    # process_input(get_input(20))
+    process_input(get_input(20), calculate_sand=True, cycles_to_run=10000)
@@ -1,50 +1,68 @@
 # day 21: hedge maze stepcounts
-from math import ceil
+from functools import partial
+from math import ceil, lcm
 from itertools import batched
 from modules.array_math import shifted_diff, addwise, mult
 from modules.parse import find_in_input, get_input
-from modules.types import Loc, Dir
+from modules.registry import Solver
+from modules.search import SetVisited, bfs_layers
+from modules.types import Loc, Grid, dir_offsets
 
 class MazeWalker:
     def __init__(self, maze: list[str], start: Loc):
         self.maze = maze
+        self.cells = Grid.from_lines(maze)
         self.size = max(len(self.maze), len(self.maze[0]))
         self.start = start
         self.steps = 0
 
-        self.all_reached: set[Loc] = set()
-        self.reached_at: list[list[Loc]] = []
+        # the maze repeats forever, so locations are packed relative to a far-off origin to keep them non-negative
+        # the origin is a whole number of mazes away, so a packed location still wraps onto the right cell
+        self.origin = lcm(self.cells.rows, self.cells.cols) * 4096
+        self.width = self.origin * 2
+        # offsets to the open neighbors of each cell, as though the maze wraps around at its edges
+        self.open_offsets = self.get_open_offsets()
+
+        self.all_reached = SetVisited()
+        self.reached_at: list[list[int]] = []
+        # the start isn't marked as reached, so it's counted again two steps in (it can always be stepped back onto)
+        self.layers = bfs_layers(self.get_valid_neighbors, [self.pack(start)], self.all_reached)
+        next(self.layers)
 
         self.found_cycle = False
         self.cycle_diff = None
         self.cycle_counts = None
 
 
-    def is_valid(self, loc: Loc) -> bool:
-        arr_row = loc.row % len(self.maze)
-        arr_col = loc.col % len(self.maze[0])
-        return self.maze[arr_row][arr_col] != "#"
+    def pack(self, loc: Loc) -> int:
+        return Loc(loc.row + self.origin, loc.col + self.origin).pack(self.width)
+
+    def unpack(self, packed: int) -> Loc:
+        return Loc.unpack(packed, self.width) - Loc(self.origin, self.origin)
+
+    def is_valid(self, row: int, col: int) -> bool:
+        return self.cells.get_wrapped(row, col) != "#"
+
+    def get_open_offsets(self) -> list[tuple[int, ...]]:
+        (cells, moves) = (self.cells, ((0, -1), (0, 1), (-1, 0), (1, 0)))
+        open_offsets = [()] * cells.size
+        for row in range(cells.rows):
+            for col in range(cells.cols):
+                open_offsets[cells.idx(row, col)] = tuple(
+                    offset for (offset, (d_row, d_col)) in zip(dir_offsets(self.width), moves)
+                    if self.is_valid(row + d_row, col + d_col))
+        return open_offsets
   
-    def get_valid_neighbors(self, loc: Loc) -> list[Loc]:
-        adjacent = [dir.from_loc(loc) for dir in Dir]
-        return [x for x in adjacent if self.is_valid(x)]
+    def get_valid_neighbors(self, packed: int) -> list[int]:
+        (row, col) = divmod(packed, self.width)
+        cell = (row % self.cells.rows) * self.cells.stride + col % self.cells.cols
+        return [packed + offset for offset in self.open_offsets[cell]]
         
     def walk_steps(self, steps: int):
         if steps <= 0:
             return
-        
-        prev_reached = [self.start] if self.steps == 0 else self.reached_at[-1]
         for _ in range(steps):
-            new_reached = []
-            for prev_loc in prev_reached:
-                neighbors = self.get_valid_neighbors(prev_loc)
-                for neighbor in neighbors:
-                    if neighbor not in self.all_reached:
-                        new_reached.append(neighbor)
-                        self.all_reached.add(neighbor)
-            self.reached_at.append(new_reached)
-            prev_reached = new_reached
-
+            self.reached_at.append(next(self.layers, []))
         self.steps += steps
 
     def find_cycle(self) -> bool:
@@ -124,7 +142,7 @@ class MazeWalker:
     def print_maze(self):
         tiles = 1
         if self.all_reached:
-            nums = ([num for loc in self.all_reached for num in loc])
+            nums = ([num for packed in self.all_reached.seen for num in self.unpack(packed)])
             width = max(nums) - min(nums)
             tiles = ceil(width / len(self.maze))
             tiles += 1 if tiles % 2 == 0 else 0
@@ -132,7 +150,7 @@ class MazeWalker:
         maze = [list(ex_line) for ex_line in [line * tiles for line in self.maze] * tiles]
         padding = (tiles // 2) * len(self.maze) 
         for (step, reached) in enumerate(self.reached_at):
-            for loc in reached:
+            for loc in map(self.unpack, reached):
                 maze[loc.row + padding][loc.col + padding] = str((step + 1) % 10)
         maze[self.start.row + padding][self.start.col + padding] = "S"
         print('\n'.join([''.join(row) for row in maze]))
@@ -144,12 +162,24 @@ def parse_input_and_find(input: str, char: str, replace: str) -> tuple[list[str]
     lines[char_loc.row] = lines[char_loc.row].replace(char, replace)
     return (lines, char_loc)
 
-def process_input(input: str, steps: int) -> int:
-    (maze, start_loc) = parse_input_and_find(input, "S", ".")
+def parse_input(input: str) -> tuple[list[str], Loc]:
+    return parse_input_and_find(input, "S", ".")
+
+def count_reachable(parsed: tuple[list[str], Loc], steps: int) -> int:
+    (maze, start_loc) = parsed
     return MazeWalker(maze, start_loc).can_reach_exactly(steps)
 
+def process_input(input: str, steps: int) -> int:
+    return count_reachable(parse_input(input), steps)
+
+solvers = {
+    1: Solver(parse_input, partial(count_reachable, steps=64)),
+    2: Solver(parse_input, partial(count_reachable, steps=26_501_365)),
+}
+
 
-# assert process_input(get_input(21, test=True), steps=6) == 16
-# process_input(get_input(21), steps=64)
-# assert process_input(get_input(21, test=True), steps=5_000) == 16_733_044
-process_input(get_input(21), steps=26_501_365)
+if __name__ == "__main__":
+    # assert process_input(get_input(21, test=True), steps=6) == 16
+    # process_input(get_input(21), steps=64)
+    # assert process_input(get_input(21, test=True), steps=5_000) == 16_733_044
+    process_input(get_input(21), steps=26_501_365)
@@ -2,6 +2,7 @@
 from collections import deque
 from typing import Iterator, NamedTuple
 from modules.parse import get_input
+from modules.registry import Solver
 from modules.types import Counter, Loc as Loc2, Loc3
 from modules.utils import sign
 
@@ -79,6 +80,10 @@ class Brick:
             loc = loc + step if loc else self.start.loc2()
             yield loc
 
+    # bricks are hashed by id, so the id has to be restored before the sets of linked bricks are unpickled
+    def __reduce__(self):
+        return (restore_brick, (self.id,), self.__dict__)
+
     def __hash__(self):
         return self.id
 
@@ -94,6 +99,11 @@ class Brick:
     def __repr__(self):
         return f"{self.start} ~ {self.end} at {self.height}"
 
+def restore_brick(id: int) -> Brick:
+    brick = Brick.__new__(Brick)
+    brick.id = id
+    return brick
+
 class GridState(NamedTuple):
     current_z: int = 0
     brick: Brick = None
@@ -165,14 +175,23 @@ def parse_line(line: str) -> Brick:
 def parse_input(input: str) -> list[Brick]:
     return [parse_line(line) for line in input.splitlines()]
 
+# the settled bricks are cached, so both parts skip the drop
+def drop_input(input: str) -> BrickRunner:
+    return BrickRunner(parse_input(input)).drop_bricks()
+
 def process_input(input: str, chain_reaction=False):
-    bricks = parse_input(input)
-    runner = BrickRunner(bricks).drop_bricks()
+    runner = drop_input(input)
     return runner.get_chain_reaction_count() if chain_reaction else runner.get_zappable_count()
 
+solvers = {
+    1: Solver(drop_input, BrickRunner.get_zappable_count),
+    2: Solver(drop_input, BrickRunner.get_chain_reaction_count),
+}
+
 
-# assert process_input(get_input(22, test=True)) == 5
-# process_input(get_input(22))
-# assert process_input(get_input(22, test=True), chain_reaction=True) == 7
-# assert process_input(get_input(22, file="my_2d_test"), chain_reaction=True) == 25
-process_input(get_input(22), chain_reaction=True)
+if __name__ == "__main__":
+    # assert process_input(get_input(22, test=True)) == 5
+    # process_input(get_input(22))
+    # assert process_input(get_input(22, test=True), chain_reaction=True) == 7
+    # assert process_input(get_input(22, file="my_2d_test"), chain_reaction=True) == 25
+    process_input(get_input(22), chain_reaction=True)
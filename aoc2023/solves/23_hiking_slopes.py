@@ -1,15 +1,17 @@
 # day 23: hiking slopes
 from collections import deque
-from dataclasses import dataclass
 from enum import Enum
-from functools import cached_property
+from functools import cached_property, partial
 from itertools import pairwise
-from math import floor, log2
+from time import perf_counter
 from typing import NamedTuple
 
+from modules import instrument
 from modules.parse import get_input
-from modules.types import Counter, Loc, Dir, KeyedPQ
-from modules.utils import filter_none, rev
+from modules.registry import Solver
+from modules.search import WeightedAdjacency, longest_path
+from modules.types import Counter, Grid, Loc, Dir
+from modules.utils import filter_none
 
 
 valid_dirs: dict[str, set[Dir]] = {
@@ -22,7 +24,6 @@ valid_dirs: dict[str, set[Dir]] = {
 
 type NodeId = int
 type Steps = int            # number of steps in path, or number of steps taken
-type EncodedNodes = int     # binary representation of one or more node ids (0 => b001, 1 => b010, 2 => b100, set(1,2) => b110, etc)
 
 class TrailMove(NamedTuple):
     loc: Loc
@@ -60,71 +61,37 @@ class ViewerJustify(Enum):
     center = 2
     right = 3
 
-@dataclass(frozen=True)
-class WalkerNode:
+class WalkerNode(NamedTuple):
     id: NodeId
-    nodes: EncodedNodes
     paths: dict[NodeId, Steps]
 
-    @cached_property
-    def enc_id(self) -> EncodedNodes:
-        return encode_id(self.id)
-
-    @cached_property
-    def longest(self) -> Steps:
-        return max(self.paths.values()) if self.paths else 0
-
-class WalkerStateKey(NamedTuple):
-    node_id: NodeId
-    remaining: EncodedNodes
-
-class WalkerState(NamedTuple):
-    node_id: NodeId
-    steps: Steps                # steps taken so far
-    max_left: Steps             # (over)estimate of max steps still available (allows A* pruning)
-    remaining: EncodedNodes
-
-    def key(self) -> "WalkerStateKey":
-        return WalkerStateKey(self.node_id, self.remaining)
-
-    def __lt__(self, other: "WalkerState"):
-        # intentionally flipped, so that Dijkstra prioritizes states with the most steps first
-        return self.steps > other.steps
-
-    def __str__(self):
-        return f"{self.steps} steps, Node {self.node_id}: done {self.remaining}"
-
-    def __repr__(self):
-        return f"{self.steps} steps, Node {self.node_id}: done {self.remaining}"
-
-
-def encode_id(node_id: NodeId) -> EncodedNodes:
-    return 1 << node_id
 
 def convert(node: MapperNode) -> WalkerNode:
-    return WalkerNode(node.id, sum([encode_id(node.id) for node in node.paths]), {node.id: path.steps for (node, path) in node.paths.items()})
+    return WalkerNode(node.id, {node.id: path.steps for (node, path) in node.paths.items()})
 
 
 class Trail:
-    def __init__(self, lines: list[str], is_slippery: bool):
-        self.lines: list[str] = lines
+    def __init__(self, grid: Grid, is_slippery: bool):
+        self.grid = grid
         self.is_slippery = is_slippery
-        self.rows = len(lines)
-        self.cols = len(lines[0])
+        self.rows = grid.rows
+        self.cols = grid.cols
         self.start: Loc = self.get_exit(0)
         self.end: Loc = self.get_exit(self.rows - 1)
 
     def get_exit(self, line_num: int) -> Loc:
-        return Loc(line_num, self.lines[line_num].index("."))
+        return Loc(line_num, self.grid.row(line_num).tobytes().index(b"."))
 
     def get(self, loc: Loc) -> str:
-        return self.lines[loc.row][loc.col]
+        return chr(self.grid.cells[loc.pack(self.grid.stride)])
 
     def get_valid_dirs(self, tile: str):
         return valid_dirs[tile] if self.is_slippery else valid_dirs["."]
 
     def is_valid_move(self, move: TrailMove) -> bool:
-        if not((0 <= move.loc.row < self.rows) and (0 <= move.loc.col < self.cols) and (tile := self.get(move.loc)) != "#"):
+        # stepping off any edge lands on the grid's newline border or outside it, so one in_bounds check covers it
+        idx = move.loc.pack(self.grid.stride)
+        if not (self.grid.in_bounds(idx) and (tile := chr(self.grid.cells[idx])) != "#"):
             return False
         return not(len((dirs := self.get_valid_dirs(tile))) == 1 and dirs[0].opposite == move.dir)
         
@@ -136,8 +103,8 @@ class Trail:
 
 # simplify the trail into nodes
 class TrailMapper:
-    def __init__(self, lines, is_slippery):
-        self.trail = Trail(lines, is_slippery)
+    def __init__(self, grid: Grid, is_slippery):
+        self.trail = Trail(grid, is_slippery)
         self.next_id = Counter(next = 0)
         self.nodes: dict[Loc, MapperNode] = {}
         self.to_process: deque[MapperNode] = deque()
@@ -278,103 +245,60 @@ class TrailWalker:
     def __init__(self, mapper: TrailMapper):
         self.trail = mapper
         self.nodes = {node.id: convert(node) for node in self.trail.nodes.values()}
-        self.nodes_to_walk: KeyedPQ[WalkerState, WalkerStateKey] = KeyedPQ(
-            init_items=[self.get_start_state()],
-            key=lambda s: s.key() if s.node_id != self.end_id else self.end_key,
-            replace_if=lambda a,b: a.steps < b.steps,
-        )
+        # adjacency arrays for the search: (steps, next node id) for each path out of each node
+        self.paths: WeightedAdjacency = [[(steps, next_id) for (next_id, steps) in self.nodes[id].paths.items()] for id in range(len(self.nodes))]
         self.end_steps: Steps = None        # longest path start-to-end found so far
+        self.end_path: list[NodeId] = None
 
     @cached_property
     def end_id(self) -> NodeId:
         return self.trail.end.id
 
-    @cached_property
-    def end_key(self) -> WalkerStateKey:
-        return WalkerStateKey(self.end_id, 0)
-
-    def get_start_state(self) -> WalkerState:
-        # this creates a state where all nodes are still remaining
-        # e.g. if the highest node id is 4, this results in set(0,1,2,3,4) => b11111
-        start_node = self.nodes[self.trail.start.id]
-        highest_node = self.nodes[len(self.nodes) - 1]
-        # overestimate of maximum number of steps possible, for A* pruning
-        max_steps = sum(node.longest for node in self.nodes.values())
-        return WalkerState(start_node.id, 0, max_steps, highest_node.enc_id * 2 - 1)
-
     def walk_trail(self, max_nodes=None) -> Steps:
-        n = 0
-        for node in self.nodes_to_walk.iter():
-            self.process_node(node)
-            n += 1
-            if max_nodes and n >= max_nodes:
-                break
+        start = perf_counter()
+        res = longest_path(self.paths, self.trail.start.id, self.end_id, max_nodes)
+        # the search visits millions of nodes, so they're counted in one go rather than timed one at a time
+        instrument.record("day23.walk_node", res.expanded, perf_counter() - start)
+        (self.end_steps, self.end_path) = (res.cost, res.path)
         return self.end_steps
 
-    def process_node(self, state: WalkerState):
-        cur_node = self.nodes[state.node_id]
-        # remaining nodes which have paths from the current node
-        next_nodes = state.remaining & cur_node.nodes
-        while next_nodes > 0:
-            # if next_nodes is b10000, b10100, b11111, etc., floor(log2) results in b10000
-            next_id = floor(log2(next_nodes))
-            next_state = self.walk_path(state, cur_node, next_id)
-            # prune this state if the steps taken plus (over)estimate of max steps left is worse than the current best path
-            if not self.end_steps or (next_state.max_left + next_state.steps >= self.end_steps):
-                added = self.nodes_to_walk.add(next_state)
-                if added and next_id == self.end_id:
-                    self.end_steps = next_state.steps
-            next_nodes -= self.nodes[next_id].enc_id
-        
-    def walk_path(self, state: WalkerState, current_node: WalkerNode, next_node: NodeId) -> WalkerState:
-        return WalkerState(next_node, state.steps + current_node.paths[next_node], state.max_left - current_node.longest, state.remaining - current_node.enc_id)
-
     def get_backtrack(self) -> list[NodeId]:
-        if not self.end_steps:
-            return None
-        end_state = self.nodes_to_walk.items.get(self.end_key, None)
-        backtrack_node_ids = [self.end_id]
-        (node_id, steps, _, remaining) = end_state
-    
-        while steps > 0:
-            prev_nodes = [n for n in self.nodes.values() if node_id in n.paths]
-            found = False
-            for prev_node in prev_nodes:
-                # construct the previous key we expect to find if prev_node is part of the longest path
-                # ("un-cross off" the node we're about to walk towards)
-                prev_remaining = remaining | prev_node.enc_id
-                prev_key = WalkerStateKey(prev_node.id, prev_remaining)
-                prev_state = self.nodes_to_walk.items.get(prev_key, None)
-                # if the number of steps is exactly the current steps minus the path length, prev_node is part of the longest path
-                prev_steps = steps - prev_node.paths[node_id]
-                if prev_state and prev_state.steps == prev_steps:
-                    (node_id, steps, _, remaining) = prev_state
-                    backtrack_node_ids.append(node_id)
-                    found = True
-                    break
-            if not found:
-                return None
-        return rev(backtrack_node_ids)
-
-def parse_input(input: str) -> list[str]:
-    return input.splitlines()
+        return self.end_path
 
-def process_input(input: str, is_slippery=True, max_nodes=None, view_trail=False):
-    lines = parse_input(input)
-    mapper = TrailMapper(lines, is_slippery).map_trail()
+def parse_input(input: str) -> Grid:
+    return Grid(input)
+
+# the junction graph is cached, so the longest-path walk skips tracing the corridors between junctions
+def map_input(input: str, is_slippery=True) -> TrailMapper:
+    return TrailMapper(parse_input(input), is_slippery).map_trail()
+
+def walk_trail(mapper: TrailMapper, max_nodes=None) -> TrailWalker:
     walker = TrailWalker(mapper)
-    res = walker.walk_trail(max_nodes)
+    walker.walk_trail(max_nodes)
+    return walker
+
+def find_longest_hike(mapper: TrailMapper) -> Steps:
+    return walk_trail(mapper).end_steps
+
+def process_input(input: str, is_slippery=True, max_nodes=None, view_trail=False):
+    walker = walk_trail(map_input(input, is_slippery), max_nodes)
     if not view_trail:
-        return res
+        return walker.end_steps
     path = walker.get_backtrack()
     viewer = TrailViewer(walker.trail, path)
     print(viewer.view_trail())
 
+solvers = {
+    1: Solver(map_input, find_longest_hike),
+    2: Solver(partial(map_input, is_slippery=False), find_longest_hike),
+}
+
 
-# assert process_input(get_input(23, test=True)) == 94
-# process_input(get_input(23))
-# assert process_input(get_input(23, test=True), is_slippery=False) == 154
-process_input(get_input(23), is_slippery=False)   # runs to completion (4m nodes, ~24s)
+if __name__ == "__main__":
+    # assert process_input(get_input(23, test=True)) == 94
+    # process_input(get_input(23))
+    # assert process_input(get_input(23, test=True), is_slippery=False) == 154
+    process_input(get_input(23), is_slippery=False)   # runs to completion (`python -m aoc2023 run 23 --profile` reports nodes walked and time per node)
 
-# process_input(get_input(23), is_slippery=False, max_nodes=1_250_000)   # stops after 1.25m nodes, but arrives at correct answer (~7s)
-# process_input(get_input(23), is_slippery=False, max_nodes=1_250_000, view_trail=True)   # prints the longest trail (~7s)
+    # process_input(get_input(23), is_slippery=False, max_nodes=1_250_000)   # stops after 1.25m nodes, with the longest trail found so far
+    # process_input(get_input(23), is_slippery=False, view_trail=True)   # prints the longest trail
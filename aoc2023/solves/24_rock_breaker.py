@@ -1,11 +1,12 @@
 # day 24: hail asteroids
-from functools import reduce
+from functools import partial, reduce
 from itertools import combinations
 from math import ceil, inf, log2, pow, sqrt
 from typing import NamedTuple
 
 from modules.array_math import addwise, mult
 from modules.parse import get_input
+from modules.registry import Solver
 
 def sq(x):
     return x*x
@@ -236,18 +237,28 @@ def parse_line(line: str) -> Rock:
 def parse_input(input: str) -> list[Rock]:
     return [parse_line(line) for line in input.splitlines()]
 
-def count_intersects(input: str, bounds: Bounds) -> int:
-    rocks = parse_input(input)
+def count_rock_intersects(rocks: list[Rock], bounds: Bounds) -> int:
     results = [res[0] for res in [check_paths(r1, r2, bounds) for (r1, r2) in combinations(rocks, 2)]]
     return sum(results)
 
-def find_breaker(input: str) -> int:
-    rocks = parse_input(input)
+def find_rock_breaker(rocks: list[Rock]) -> int:
     breaker = BreakerFinder(rocks)
     return breaker.solve()
 
+def count_intersects(input: str, bounds: Bounds) -> int:
+    return count_rock_intersects(parse_input(input), bounds)
+
+def find_breaker(input: str) -> int:
+    return find_rock_breaker(parse_input(input))
+
+solvers = {
+    1: Solver(parse_input, partial(count_rock_intersects, bounds=Bounds(200_000_000_000_000, 400_000_000_000_000))),
+    2: Solver(parse_input, find_rock_breaker),
+}
+
 
-# assert count_intersects(get_input(24, test=True), Bounds(7, 27)) == 2
-# count_intersects(get_input(24), Bounds(200_000_000_000_000, 400_000_000_000_000))
-# assert find_breaker(get_input(24, test=True)) == 47   # doesn't work with the test data - it finds a non-zero posal minima
-find_breaker(get_input(24))
+if __name__ == "__main__":
+    # assert count_intersects(get_input(24, test=True), Bounds(7, 27)) == 2
+    # count_intersects(get_input(24), Bounds(200_000_000_000_000, 400_000_000_000_000))
+    # assert find_breaker(get_input(24, test=True)) == 47   # doesn't work with the test data - it finds a non-zero posal minima
+    find_breaker(get_input(24))
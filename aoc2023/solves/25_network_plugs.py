@@ -1,71 +1,42 @@
 # day 25: network plugs
 from modules.parse import get_input
+from modules.registry import Solver
+from modules.search import Adjacency, ByteVisited, bfs_layers, build_adjacency
 from modules.types import DefaultKeydict
 from modules.utils import flatten
 
 
-class Node:
-    def __init__(self, id: str):
-        self.id = id
-        self.nodes: list[Node] = []
-
-    def add(self, other: "Node"):
-        self.nodes.append(other)
-        other.nodes.append(self)
-
-    def remove(self, other: "Node"):
-        self.nodes.remove(other)
-        other.nodes.remove(self)
-
-    def get_distmap(self) ->  list[list["Node"]]:
-        dist = 0
-        check = []
-        next = [self]
-        seen = set([self])
-        dists = []
-        while next:
-            dists.append(next.copy())
-            dist += 1
-            (check, next) = (next, [])
-            for node in check:
-                for n in node.nodes:
-                    if n not in seen:
-                        next.append(n)
-                        seen.add(n)
-        return dists
-    
-    def __repr__(self):
-        return self.id
-    
-    def __str__(self):
-        return self.id
-
 class Network:
     def __init__(self, lines: list[tuple[str, list[str]]]):
-        self.nodes: dict[str, Node] = self.build_nodes(lines)
-
-    def build_nodes(self, lines: list[tuple[str, list[str]]]):
-        nodes: dict[str, Node] = DefaultKeydict(lambda id: Node(id))
-        for (src, dsts) in lines:
-            srcnode = nodes[src]
-            for dst in dsts:
-                srcnode.add(nodes[dst])
-        return dict(nodes)
-
-    def find_ideal_distmap(self) -> list[list[Node]]:
+        # components are numbered in order of appearance; the search works on the ids
+        ids: dict[str, int] = DefaultKeydict(lambda name: len(ids))
+        edges = [(ids[src], ids[dst]) for (src, dsts) in lines for dst in dsts]
+        self.names = list(ids)
+        self.adj: Adjacency = build_adjacency(len(self.names), edges)
+
+    def remove(self, a: int, b: int):
+        self.adj[a].remove(b)
+        self.adj[b].remove(a)
+
+    def get_distmap(self, start: int) -> list[list[int]]:
+        visited = ByteVisited(len(self.adj))
+        visited.add(start)
+        return list(bfs_layers(self.adj.__getitem__, [start], visited))
+
+    def find_ideal_distmap(self) -> list[list[int]]:
         best = None
         best_distmap = None
-        for node in self.nodes.values():
-            distmap = node.get_distmap()
+        for node in range(len(self.adj)):
+            distmap = self.get_distmap(node)
             dists = [len(nodes) for nodes in distmap[1:-1]]
             if len(dists) > 0 and (best is None or min(dists) < best):
                 best = min(dists)
                 best_distmap = distmap
         return best_distmap
 
-    def print_distmap(self, distmap: list[list[Node]]):
+    def print_distmap(self, distmap: list[list[int]]):
         for (idx, nodes) in enumerate(distmap):
-            print(f"{idx:2} ({len(nodes):3}): {', '.join(sorted([n.id for n in nodes]))}")
+            print(f"{idx:2} ({len(nodes):3}): {', '.join(sorted([self.names[n] for n in nodes]))}")
 
     def get_cluster_values(self):
         distmap = self.find_ideal_distmap()
@@ -78,13 +49,13 @@ class Network:
         bridge = set(distmap[bridge_idx])
 
         for node in bridge:
-            n_left = [n for n in node.nodes if n in left]
-            n_right = [n for n in node.nodes if n in right]
+            n_left = [n for n in self.adj[node] if n in left]
+            n_right = [n for n in self.adj[node] if n in right]
             snip = n_left[0] if len(n_left) < len(n_right) else n_right[0]
-            node.remove(snip)
+            self.remove(node, snip)
 
-        left_cluster = distmap[1][0].get_distmap()
-        right_cluster = distmap[-1][0].get_distmap()
+        left_cluster = self.get_distmap(distmap[1][0])
+        right_cluster = self.get_distmap(distmap[-1][0])
         left_size = sum([len(nodes) for nodes in left_cluster])
         right_size = sum([len(nodes) for nodes in right_cluster])
 
@@ -94,9 +65,21 @@ def parse_line(line: list[str]) -> tuple[str, list[str]]:
     (src, dsts) = line.split(r": ")
     return (src, dsts.split(" "))
 
-def parse_input(input: str):
-    parsed = [parse_line(line) for line in input.splitlines()]
-    return Network(parsed).get_cluster_values()
+def parse_input(input: str) -> list[tuple[str, list[str]]]:
+    return [parse_line(line) for line in input.splitlines()]
+
+# the adjacency lists are cached, so the cut search skips numbering the components and building the edges
+def build_network(input: str) -> Network:
+    return Network(parse_input(input))
+
+def process_input(input: str):
+    return build_network(input).get_cluster_values()
+
+# day 25 only has one puzzle (the second star is awarded for finishing the other days)
+solvers = {
+    1: Solver(build_network, Network.get_cluster_values),
+}
 
-# assert parse_input(get_input(25, test=True)) == 54
-parse_input(get_input(25))
+if __name__ == "__main__":
+    # assert process_input(get_input(25, test=True)) == 54
+    process_input(get_input(25))